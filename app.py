@@ -11,16 +11,10 @@ from pathlib import Path
 # Add the current directory to Python path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-# Import and run the main application
+# Import and run the main application (output directories are ensured on import)
 from main import create_interface
 
 if __name__ == "__main__":
-    # Create output directories
-    Path("outputs/posters").mkdir(parents=True, exist_ok=True)
-    Path("outputs/blogs").mkdir(parents=True, exist_ok=True)
-    Path("outputs/presentations").mkdir(parents=True, exist_ok=True)
-    Path("data").mkdir(parents=True, exist_ok=True)
-    
     # Create the Gradio interface
     app = create_interface()
     
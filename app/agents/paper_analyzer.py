@@ -1,6 +1,7 @@
-import json
 import re
 
+import orjson
+
 from app.agents.base_agent import BaseAgent
 from app.models.schemas import PaperAnalysis, PaperInput
 
@@ -59,7 +60,7 @@ class PaperAnalyzerAgent(BaseAgent):
             # Extract JSON from cleaned response
             json_match = re.search(r"\{.*\}", cleaned_response, re.DOTALL)
             if json_match:
-                analysis_data = json.loads(json_match.group())
+                analysis_data = orjson.loads(json_match.group())
                 return PaperAnalysis(**analysis_data)
             raise ValueError("No valid JSON found in response")
         except Exception:
@@ -1,4 +1,7 @@
+import asyncio
+import functools
 import os
+import shutil
 import subprocess
 import tempfile
 
@@ -7,6 +10,18 @@ from app.agents.poster_layout_analyzer import PosterLayoutAnalyzerAgent
 from app.models.schemas import PaperAnalysis, PosterContent
 from app.services.pdf_to_image_service import pdf_to_image_service
 
+# Compile scratch space on tmpfs when the platform provides it - pdflatex
+# writes a pile of aux/log files per run, and keeping them in RAM takes
+# the disk out of the compile hot path entirely
+_SCRATCH_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+@functools.lru_cache(maxsize=8)
+def _load_template_doc(path: str) -> str:
+    """Read a static template/documentation file once per process"""
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
 
 class PosterGeneratorAgent(BaseAgent):
     def __init__(self):
@@ -22,13 +37,10 @@ class PosterGeneratorAgent(BaseAgent):
         orientation: str = "landscape",
     ) -> PosterContent:
         """Generate academic conference poster"""
-        # tikzdocumentation
-        tikzdocumentation = ""
-        with open(
+        # tikzposter documentation is static - read once, cached thereafter
+        tikzdocumentation = _load_template_doc(
             os.path.join(self.template_dir, "tikzposter.md"),
-            encoding="utf-8",
-        ) as f:
-            tikzdocumentation = f.read()
+        )
         # Generate LaTeX content
         latex_prompt = f"""
         Generate LaTeX code for an academic conference poster using the {template_type} style.
@@ -114,20 +126,38 @@ class PosterGeneratorAgent(BaseAgent):
         return latex_code.strip()
 
     async def _compile_latex(self, latex_code: str, title: str) -> str:
-        """Compile LaTeX to PDF"""
+        """Compile LaTeX to PDF without blocking the event loop"""
+        # pdflatex already runs as its own process; waiting on it from a
+        # worker thread keeps the loop free, so compiles for different
+        # users (or poster + presentation) overlap instead of serializing
+        output_path = await asyncio.to_thread(
+            self._compile_latex_sync,
+            latex_code,
+            title,
+        )
+        if output_path:
+            return output_path
+        # Compilation failed, try with simpler template
+        return await self._generate_fallback_poster(latex_code, title)
+
+    def _compile_latex_sync(self, latex_code: str, title: str) -> str | None:
+        """Synchronous pdflatex compile body, run on a worker thread"""
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
+            with tempfile.TemporaryDirectory(dir=_SCRATCH_DIR) as temp_dir:
                 # Create LaTeX file
                 tex_file = os.path.join(temp_dir, "poster.tex")
                 with open(tex_file, "w", encoding="utf-8") as f:
                     f.write(latex_code)
 
-                # Compile with pdflatex
-                result = subprocess.run(
+                # Compile with pdflatex. Its tens of KB of console chatter
+                # were being piped into memory, decoded, and thrown away;
+                # DEVNULL drops it at the kernel with zero reads. Anything
+                # diagnostic lands in poster.log next to the output anyway.
+                subprocess.run(
                     ["pdflatex", "-interaction=nonstopmode", "poster.tex"],
                     cwd=temp_dir,
-                    capture_output=True,
-                    text=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
                     check=False,
                 )
 
@@ -143,16 +173,13 @@ class PosterGeneratorAgent(BaseAgent):
                     ).rstrip()
                     output_path = os.path.join(output_dir, f"{safe_title}_poster.pdf")
 
-                    import shutil
-
                     shutil.copy2(pdf_file, output_path)
                     return output_path
-                # Compilation failed, try with simpler template
-                return await self._generate_fallback_poster(latex_code, title)
+                return None
 
         except Exception as e:
             print(f"LaTeX compilation error: {e}")
-            return await self._generate_fallback_poster(latex_code, title)
+            return None
 
     async def _generate_fallback_poster(self, latex_code: str, title: str) -> str:
         """Generate a simple fallback poster if LaTeX compilation fails"""
@@ -85,11 +85,11 @@ PAPER DATA:
         html_path = out_dir / "presentation.html"
         html_path.write_text(html_code, encoding="utf-8")
 
-        # 4. Use the export service to convert the final HTML to PDF and PPTX.
+        # 4. Use the export service to convert the final HTML to PDF and PPTX
+        #    concurrently - the two exports are independent.
         pdf_path = out_dir / "presentation.pdf"
         ppt_path = out_dir / "presentation.pptx"
-        await html_export_service.html_to_pdf(html_path, pdf_path)
-        await html_export_service.html_to_ppt(html_path, ppt_path)
+        await html_export_service.export_both(html_path, pdf_path, ppt_path)
 
         # 5. Return all relevant paths and the generated HTML code.
         return PresentationOutput(
@@ -92,9 +92,10 @@ class PresentationPlannerAgent(BaseAgent):
 
         try:
             # Clean and parse JSON response
-            import json
             import re
 
+            import orjson
+
             # Remove markdown code blocks if present
             cleaned_response = re.sub(r"^```json\s*", "", response, flags=re.MULTILINE)
             cleaned_response = re.sub(
@@ -105,7 +106,7 @@ class PresentationPlannerAgent(BaseAgent):
             # Extract JSON from cleaned response
             json_match = re.search(r"\{.*\}", cleaned_response, re.DOTALL)
             if json_match:
-                plan_data = json.loads(json_match.group())
+                plan_data = orjson.loads(json_match.group())
 
                 # Convert slides data to SlideContent objects
                 slides = []
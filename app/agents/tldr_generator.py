@@ -1,3 +1,5 @@
+import asyncio
+
 from app.agents.base_agent import BaseAgent
 from app.models.schemas import PaperAnalysis, TLDRContent
 from app.services.image_service import image_service
@@ -82,25 +84,23 @@ class TLDRGeneratorAgent(BaseAgent):
         Don't include any other information except the caption content. No additional headers or ending text in the response.
         """
 
-        # Generate all content
-        linkedin_post = await self._generate_platform_content(linkedin_prompt)
-        twitter_thread = await self._generate_twitter_thread(twitter_prompt)
-        facebook_post = await self._generate_platform_content(facebook_prompt)
-        instagram_caption = await self._generate_platform_content(instagram_prompt)
+        # Generate all platform content and images concurrently - these are
+        # independent network-bound LLM calls, so run them in parallel
+        (
+            linkedin_post,
+            twitter_thread,
+            facebook_post,
+            instagram_caption,
+            images,
+        ) = await asyncio.gather(
+            self._generate_platform_content(linkedin_prompt),
+            self._generate_twitter_thread(twitter_prompt),
+            self._generate_platform_content(facebook_prompt),
+            self._generate_platform_content(instagram_prompt),
+            self._generate_images_safe(analysis),
+        )
         hashtags = self._generate_hashtags(analysis)
 
-        # Generate images for all platforms
-        try:
-            images = await image_service.generate_all_social_images(analysis)
-        except Exception as e:
-            print(f"Error generating images: {e!s}")
-            images = {
-                "linkedin": None,
-                "twitter": None,
-                "facebook": None,
-                "instagram": None,
-            }
-
         return TLDRContent(
             linkedin_post=linkedin_post,
             twitter_thread=twitter_thread,
@@ -113,6 +113,19 @@ class TLDRGeneratorAgent(BaseAgent):
             instagram_image=images.get("instagram"),
         )
 
+    async def _generate_images_safe(self, analysis: PaperAnalysis) -> dict:
+        """Generate images for all platforms, falling back to None on failure"""
+        try:
+            return await image_service.generate_all_social_images(analysis)
+        except Exception as e:
+            print(f"Error generating images: {e!s}")
+            return {
+                "linkedin": None,
+                "twitter": None,
+                "facebook": None,
+                "instagram": None,
+            }
+
     async def _generate_platform_content(self, prompt: str) -> str:
         """Generate content for a specific platform"""
         messages = [
@@ -3,7 +3,10 @@ import os
 try:
     from dotenv import load_dotenv
 
-    load_dotenv()
+    # Guard so reload-mode re-imports don't re-read and re-parse .env
+    if os.environ.get("_DOTENV_LOADED") != "1":
+        load_dotenv()
+        os.environ["_DOTENV_LOADED"] = "1"
 except ImportError:
     # dotenv not available, use environment variables directly
     pass
@@ -57,6 +60,10 @@ class Settings:
         # DeepInfra API for blog images
         self.DEEPINFRA_API_KEY: str = os.getenv("DEEPINFRA_API_KEY", "")
 
+        # Concurrency limits for outbound provider calls
+        self.IMAGE_GEN_CONCURRENCY: int = int(os.getenv("IMAGE_GEN_CONCURRENCY", "2"))
+        self.LLM_CONCURRENCY: int = int(os.getenv("LLM_CONCURRENCY", "8"))
+
         # API Keys
         self.DEVTO_API_KEY: str = os.getenv("DEVTO_API_KEY", "")
 
@@ -1,10 +1,21 @@
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.config.settings import settings
 from app.database.models import Base
 
-engine = create_engine(settings.DATABASE_URL)
+
+def _json_dumps(value) -> str:
+    """orjson-backed serializer for JSON columns (returns str for SQLAlchemy)"""
+    return orjson.dumps(value).decode()
+
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -1,14 +1,25 @@
 import asyncio
-import base64
+import hashlib
+import logging
 import re
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import requests
+import aiohttp
+import orjson
+import pybase64
 
 from app.config.settings import settings
 from app.models.schemas import PaperAnalysis
 
+logger = logging.getLogger(__name__)
+
+# Markdown header pattern used to split blog content - compiled once
+_HEADER_RE = re.compile(r"(^#{1,3}\s+.*$)", re.MULTILINE)
+
+# Sentinel returned by the upload path when no hosted URL came back; module
+# level so comparisons hit the interned string
+_NO_URL = "No image URL found"
+
 
 class BlogImageService:
     """Service for generating and managing images for blog posts"""
@@ -20,6 +31,21 @@ class BlogImageService:
         self.upload_api_key = (
             "6d207e02198a847aa98d0a2a901485a5"  # FreeImage.host API key
         )
+        self._session: aiohttp.ClientSession | None = None
+        # Bound in-flight generations to stay under provider rate limits
+        self._semaphore = asyncio.Semaphore(5)
+        # Prompt-generation results keyed by paper digest - regenerating the
+        # same blog skips the heavy-model LLM call entirely
+        self._prompt_cache: dict[str, list[str]] = {}
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily create the shared HTTP session with a pooled connector"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, limit_per_host=8),
+                timeout=aiohttp.ClientTimeout(total=60),
+            )
+        return self._session
 
     async def generate_blog_images(
         self,
@@ -35,16 +61,14 @@ class BlogImageService:
             image_urls = await self._generate_images_async(image_prompts)
 
             # Create markdown image tags with proper formatting
-            markdown_images = []
-            for i, url in enumerate(image_urls):
-                if url and url != "No image URL found":
-                    caption = self._generate_image_caption(analysis, i)
-                    markdown_images.append(f"![{caption}]({url})")
-
-            return markdown_images
+            return [
+                f"![{self._generate_image_caption(analysis, i)}]({url})"
+                for i, url in enumerate(image_urls)
+                if url and url != _NO_URL
+            ]
 
         except Exception as e:
-            print(f"Error generating blog images: {e}")
+            logger.error("Error generating blog images: %s", e)
             return []
 
     async def _generate_image_prompts(
@@ -53,9 +77,19 @@ class BlogImageService:
         content: str,
     ) -> list[str]:
         """Generate image prompts based on the research paper and blog content"""
-        from app.services.llm_service import LLMService
-
-        llm_service = LLMService()
+        # Module singleton (as in base_agent) so the per-instance client
+        # cache and request semaphore actually persist across calls
+        from app.services.llm_service import llm_service
+
+        # The prompt is deterministic given the analysis and content preview,
+        # so a cheap blake2b digest is enough to reuse prior responses
+        cache_key = hashlib.blake2b(
+            f"{analysis.title}|{analysis.abstract[:300]}|{content[:500]}".encode(),
+            digest_size=16,
+        ).hexdigest()
+        cached = self._prompt_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         prompt_generation_text = f"""
         You are an expert in creating visual prompts for AI image generation to enhance blog posts about research papers.
@@ -108,47 +142,35 @@ class BlogImageService:
             enhanced_prompt = f"{prompt}, professional scientific illustration, clean modern design, educational diagram style, high quality, detailed"
             enhanced_prompts.append(enhanced_prompt)
 
+        self._prompt_cache[cache_key] = enhanced_prompts
         return enhanced_prompts
 
     async def _generate_images_async(self, prompts: list[str]) -> list[str]:
-        """Generate images asynchronously using DeepInfra API"""
-        loop = asyncio.get_event_loop()
-
-        # Use ThreadPoolExecutor to handle blocking requests
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            futures = [
-                loop.run_in_executor(executor, self._fetch_image_url, prompt)
-                for prompt in prompts
-            ]
+        """Generate and upload images as a pipeline using the DeepInfra API"""
+        results = await asyncio.gather(
+            *[self._fetch_and_upload(prompt) for prompt in prompts],
+            return_exceptions=True,
+        )
+        return [
+            url
+            for url in results
+            if isinstance(url, str) and url != _NO_URL
+        ]
 
-            results = await asyncio.gather(*futures, return_exceptions=True)
-
-            # Process results and upload images
-            upload_futures = []
-            for result in results:
-                if isinstance(result, str) and result != "No image URL found":
-                    upload_futures.append(
-                        loop.run_in_executor(
-                            executor,
-                            self._process_and_upload_image,
-                            result,
-                        ),
-                    )
-
-            if upload_futures:
-                uploaded_urls = await asyncio.gather(
-                    *upload_futures,
-                    return_exceptions=True,
-                )
-                return [
-                    url if not isinstance(url, Exception) else "No image URL found"
-                    for url in uploaded_urls
-                ]
+    async def _fetch_and_upload(self, prompt: str) -> str:
+        """Fetch one image and upload it immediately.
 
-            return []
+        Each prompt runs this chain concurrently, so an upload overlaps the
+        still-running generations instead of waiting behind a two-stage
+        gather barrier.
+        """
+        image_data = await self._fetch_image_url(prompt)
+        if not isinstance(image_data, bytes):
+            return _NO_URL
+        return await self._process_and_upload_image(image_data)
 
-    def _fetch_image_url(self, prompt: str) -> str:
-        """Fetch image from DeepInfra API (synchronous)"""
+    async def _fetch_image_url(self, prompt: str) -> bytes | None:
+        """Fetch image from DeepInfra API as raw PNG bytes"""
         url = f"https://api.deepinfra.com/v1/inference/{self.deepinfra_model}"
         headers = {
             "Content-Type": "application/json",
@@ -159,99 +181,97 @@ class BlogImageService:
             "num_inference_steps": 20,
             "width": 1024,
             "height": 768,  # Better aspect ratio for blog images
-            "response_format": "b64_json",
+            # Ask for a URL so the PNG isn't shipped in-band as base64
+            # (33% transfer overhead plus a decode pass per image)
+            "response_format": "url",
         }
-        print(f"Payload: {payload}")  # Debugging output
+        logger.debug("Payload: %s", payload)
 
         try:
-            response = requests.post(url, json=payload, headers=headers, timeout=60)
-            if response.status_code == 200:
-                response_data = response.json()
-                print(f"Response: {response_data}")  # Debugging output
-
-                # Handle response format with data array and b64_json
-                data = response_data.get("data", [])
-                if data and len(data) > 0:
-                    b64_json = data[0].get("b64_json")
-                    if b64_json:
-                        return self._save_and_return_base64_image(
-                            b64_json,
-                            "temp_image.png",
-                        )
-
-                # Handle response format with direct image_url
-                if "image_url" in response_data:
-                    return self._download_and_convert_image(response_data["image_url"])
-
-                return "No image URL found"
-
-            print(f"Request failed: {response.status_code}, {response.text}")
-            return "No image URL found"
+            session = await self._get_session()
+            async with self._semaphore:
+                async with session.post(
+                    url,
+                    data=orjson.dumps(payload),
+                    headers=headers,
+                ) as response:
+                    if response.status == 200:
+                        response_data = await response.json()
+                        logger.debug("Response: %s", response_data)
+
+                        # Handle response format with data array
+                        data = response_data.get("data", [])
+                        if data and len(data) > 0:
+                            image_url = data[0].get("url")
+                            if image_url:
+                                return await self._download_image(image_url)
+
+                            # Fallback for providers that still answer b64_json
+                            b64_json = data[0].get("b64_json")
+                            if b64_json:
+                                return self._save_and_decode_base64_image(
+                                    b64_json,
+                                    "temp_image.png",
+                                )
+
+                        # Handle response format with direct image_url
+                        if "image_url" in response_data:
+                            return await self._download_image(
+                                response_data["image_url"],
+                            )
+
+                        return None
+
+                    body = await response.text()
+                    logger.warning("Request failed: %s, %s", response.status, body)
+                    return None
         except Exception as e:
-            print(f"An error occurred: {e!s}")
-            return "No image URL found"
+            logger.error("An error occurred: %s", e)
+            return None
 
-    def _save_and_return_base64_image(self, b64_data: str, filename: str) -> str:
-        """Save base64 image data to file and return data URL."""
-        print(f"Saving image to temp file: {filename}")
-        print(f"Base64 length: {len(b64_data)}")
-        print(f"Image data: {b64_data[:30]}...")  # Print first 30 chars for debugging
+    def _save_and_decode_base64_image(self, b64_data: str, filename: str) -> bytes:
+        """Decode base64 image data once, save it, and return the raw bytes."""
+        logger.debug("Saving image to temp file: %s (base64 length %d)", filename, len(b64_data))
 
+        image_data = pybase64.b64decode(b64_data, validate=False)
         temp_path = self.output_dir / filename
         with temp_path.open("wb") as image_file:
-            image_file.write(base64.b64decode(b64_data))
+            image_file.write(image_data)
 
-        return f"data:image/png;base64,{b64_data}"
+        return image_data
 
-    def _download_and_convert_image(self, image_url: str) -> str:
-        """Download image from URL and convert to base64."""
-        print(f"Downloading image from URL: {image_url}")
+    async def _download_image(self, image_url: str) -> bytes | None:
+        """Download image from URL and return the raw bytes."""
+        logger.debug("Downloading image from URL: %s", image_url)
 
         try:
-            img_response = requests.get(image_url, timeout=60)
-            if img_response.status_code == 200:
-                # Convert image to base64
-                image_data = img_response.content
-                b64_encoded = base64.b64encode(image_data).decode("utf-8")
+            session = await self._get_session()
+            async with session.get(image_url) as img_response:
+                if img_response.status == 200:
+                    image_data = await img_response.read()
 
-                # Save the image to a file for debugging
-                print("Saving downloaded image to temp file...")
-                print(f"Image size: {len(image_data)} bytes")
+                    # Save the image to a file for debugging
+                    logger.debug("Saving downloaded image (%d bytes) to temp file", len(image_data))
 
-                temp_path = self.output_dir / "temp_downloaded_image.png"
-                with temp_path.open("wb") as image_file:
-                    image_file.write(image_data)
+                    temp_path = self.output_dir / "temp_downloaded_image.png"
+                    with temp_path.open("wb") as image_file:
+                        image_file.write(image_data)
 
-                return f"data:image/png;base64,{b64_encoded}"
+                    return image_data
 
-            print(f"Failed to download image: {img_response.status_code}")
-            return "No image URL found"
+                logger.warning("Failed to download image: %s", img_response.status)
+                return None
         except Exception as download_error:
-            print(f"Error downloading image: {download_error}")
-            return "No image URL found"
+            logger.error("Error downloading image: %s", download_error)
+            return None
 
-    def _process_and_upload_image(self, base64_string: str) -> str:
-        """Process base64 image and upload to hosting service (synchronous)"""
+    async def _process_and_upload_image(self, image_data: bytes) -> str:
+        """Upload raw image bytes to the hosting service"""
         try:
-            # Handle both formats: "data:image/png;base64,..." and just base64 string
-            if base64_string.startswith("data:image"):
-                # Extract base64 data from data URL
-                image_data = base64.b64decode(base64_string.split(",")[-1])
-            else:
-                # Direct base64 string
-                image_data = base64.b64decode(base64_string)
-
-            temp_filename = f"temp_blog_image_{hash(base64_string) % 1000000}.png"
-            temp_path = self.output_dir / temp_filename
-
-            with open(temp_path, "wb") as image_file:
-                image_file.write(image_data)
-
-            # Upload to hosting service
+            # Encode straight from the in-memory bytes - nothing else reads
+            # the image, so there is no temp file to write or clean up
             url = "https://freeimage.host/api/1/upload"
-
-            with open(temp_path, "rb") as image_file:
-                base64_image = base64.b64encode(image_file.read()).decode("utf-8")
+            base64_image = pybase64.b64encode(image_data).decode("ascii")
 
             payload = {
                 "key": self.upload_api_key,
@@ -260,37 +280,31 @@ class BlogImageService:
                 "format": "json",
             }
 
-            response = requests.post(url, data=payload, timeout=60)
-
-            if response.status_code == 200:
-                response_data = response.json()
-                hosted_url = response_data.get("image", {}).get(
-                    "url",
-                    "No image URL found",
-                )
-
-                # Clean up temp file
-                try:
-                    temp_path.unlink()
-                except:
-                    pass
-
-                return hosted_url
-            print(f"Upload failed: {response.status_code}, {response.text}")
-            return "No image URL found"
+            session = await self._get_session()
+            async with session.post(url, data=payload) as response:
+                if response.status == 200:
+                    response_data = await response.json()
+                    return response_data.get("image", {}).get("url", _NO_URL)
+                body = await response.text()
+                logger.warning("Upload failed: %s, %s", response.status, body)
+                return _NO_URL
 
         except Exception as e:
-            print(f"Error processing/uploading image: {e!s}")
-            return "No image URL found"
+            logger.error("Error processing/uploading image: %s", e)
+            return _NO_URL
+
+    def _build_captions(self, analysis: PaperAnalysis) -> list[str]:
+        """Build the caption list for an analysis"""
+        title_50 = analysis.title[:50]
+        return [
+            f"Conceptual illustration of {title_50}...",
+            f"Methodology visualization for {title_50}...",
+            f"Key findings illustration from {title_50}...",
+        ]
 
     def _generate_image_caption(self, analysis: PaperAnalysis, image_index: int) -> str:
         """Generate appropriate captions for images"""
-        captions = [
-            f"Conceptual illustration of {analysis.title[:50]}...",
-            f"Methodology visualization for {analysis.title[:50]}...",
-            f"Key findings illustration from {analysis.title[:50]}...",
-        ]
-
+        captions = self._build_captions(analysis)
         if image_index < len(captions):
             return captions[image_index]
         return f"Research illustration from {analysis.title[:50]}..."
@@ -301,21 +315,20 @@ class BlogImageService:
             return content
 
         # Split content into sections (by headers)
-        sections = re.split(r"(^#{1,3}\s+.*$)", content, flags=re.MULTILINE)
+        sections = _HEADER_RE.split(content)
+
+        # Insert images at strategic points: after the introduction, at the
+        # midpoint and near the end - indices computed once up front
+        n = len(sections)
+        insert_at = {2, n // 2, n - 3}
 
-        # Insert images at strategic points
         enhanced_content = []
         image_index = 0
 
         for i, section in enumerate(sections):
             enhanced_content.append(section)
 
-            # Add image after introduction (first section after first header)
-            if (
-                (i == 2 and image_index < len(images))
-                or (i == len(sections) // 2 and image_index < len(images))
-                or (i == len(sections) - 3 and image_index < len(images))
-            ):
+            if i in insert_at and image_index < len(images):
                 enhanced_content.append(f"\n\n{images[image_index]}\n\n")
                 image_index += 1
 
@@ -1,138 +1,140 @@
-import asyncio
+import logging
 from typing import Any
 
-import requests
+import httpx
+import orjson
 
 from app.config.settings import settings
 from app.models.schemas import BlogContent
 
+logger = logging.getLogger(__name__)
+
 
 class DevToService:
     def __init__(self):
         # Don't store the API key at init, get it dynamically
         self.base_url = "https://dev.to/api"
+        # Pooled async client so repeated publishes reuse the TCP+TLS connection
+        self._client: httpx.AsyncClient | None = None
 
     def get_api_key(self):
         """Get the current API key (with runtime override support)"""
         return settings.DEVTO_API_KEY_CURRENT
 
+    def _get_client(self) -> httpx.AsyncClient:
+        """Lazily create the shared async HTTP client"""
+        if self._client is None or self._client.is_closed:
+            # Explicit keepalive limits so bursts of publishes reuse warm
+            # connections instead of opening a fresh TLS handshake each
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+            )
+        return self._client
+
     async def publish_article(
         self,
         blog_content: BlogContent,
         publish_now: bool = False,
     ) -> dict[str, Any]:
         """Publish article to DEV.to"""
-
-        def _sync_publish():
-            try:
-                # Check if API key is configured
-                api_key = self.get_api_key()
-                if not api_key:
-                    return {
-                        "success": False,
-                        "error": "DEV.to API key is not configured. Please set the DEVTO_API_KEY environment variable or override it in the Configuration tab.",
-                    }
-
-                headers = {
-                    "api-key": api_key,
-                    "Content-Type": "application/json",
-                }
-
-                # Ensure tags is a list of strings
-                tags = blog_content.tags if isinstance(blog_content.tags, list) else []
-                # DEV.to has a limit of 4 tags max
-                tags = tags[:4] if len(tags) > 4 else tags
-
-                article_data = {
-                    "article": {
-                        "title": blog_content.title,
-                        "body_markdown": blog_content.content,
-                        "published": publish_now,
-                        "tags": tags,
-                        "description": blog_content.meta_description,
-                    },
-                }
-
-                # Only add series if it's not empty
-                if hasattr(blog_content, "series") and blog_content.series:
-                    article_data["article"]["series"] = blog_content.series
-
-                print("=== DEV.to Publish Debug Info ===")
-                print(f"API Key present: {bool(self.api_key)}")
-                print(f"API Key length: {len(self.api_key) if self.api_key else 0}")
-                print(f"Title: {blog_content.title}")
-                print(f"Tags: {tags}")
-                print(f"Content length: {len(blog_content.content)}")
-                print(f"Description: {blog_content.meta_description}")
-                print("Article data structure:")
-                print(article_data)
-
-                response = requests.post(
-                    f"{self.base_url}/articles",
-                    json=article_data,
-                    headers=headers,
-                    timeout=30,  # Add timeout
-                )
-                response.raise_for_status()
-                result = response.json()
-
-                return {
-                    "success": True,
-                    "url": result.get("url"),
-                    "id": result.get("id"),
-                    "published": result.get("published", False),
-                }
-
-            except requests.exceptions.HTTPError as e:
-                # Get the detailed error response from DEV.to
-                error_details = "Unknown error"
-                if hasattr(e, "response") and e.response is not None:
-                    try:
-                        error_details = e.response.json()
-                    except:
-                        error_details = e.response.text
-
-                print(f"DEV.to API Error: {e}")
-                print(f"Error details: {error_details}")
-
-                return {
-                    "success": False,
-                    "error": f"DEV.to API Error: {e!s} - Details: {error_details}",
-                }
-            except Exception as e:
-                print(f"General error: {e}")
+        try:
+            # Check if API key is configured
+            api_key = self.get_api_key()
+            if not api_key:
                 return {
                     "success": False,
-                    "error": str(e),
+                    "error": "DEV.to API key is not configured. Please set the DEVTO_API_KEY environment variable or override it in the Configuration tab.",
                 }
 
-        # Run the synchronous function in a thread pool
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _sync_publish)
+            headers = {
+                "api-key": api_key,
+                "Content-Type": "application/json",
+            }
+
+            # Ensure tags is a list of strings
+            tags = blog_content.tags if isinstance(blog_content.tags, list) else []
+            # DEV.to has a limit of 4 tags max
+            tags = tags[:4] if len(tags) > 4 else tags
+
+            article_data = {
+                "article": {
+                    "title": blog_content.title,
+                    "body_markdown": blog_content.content,
+                    "published": publish_now,
+                    "tags": tags,
+                    "description": blog_content.meta_description,
+                },
+            }
+
+            # Only add series if it's not empty
+            if hasattr(blog_content, "series") and blog_content.series:
+                article_data["article"]["series"] = blog_content.series
+
+            logger.debug(
+                "DEV.to publish: key_present=%s title=%r tags=%s content_len=%d",
+                bool(api_key),
+                blog_content.title,
+                tags,
+                len(blog_content.content),
+            )
+            logger.debug("Article data structure: %s", article_data)
+
+            # orjson serializes large markdown bodies far faster than the
+            # stdlib encoder httpx would use for json=
+            response = await self._get_client().post(
+                "/articles",
+                content=orjson.dumps(article_data),
+                headers=headers,
+            )
+            response.raise_for_status()
+            result = response.json()
+
+            return {
+                "success": True,
+                "url": result.get("url"),
+                "id": result.get("id"),
+                "published": result.get("published", False),
+            }
+
+        except httpx.HTTPStatusError as e:
+            # Get the detailed error response from DEV.to
+            try:
+                error_details = e.response.json()
+            except Exception:
+                error_details = e.response.text
+
+            logger.error("DEV.to API Error: %s - details: %s", e, error_details)
+
+            return {
+                "success": False,
+                "error": f"DEV.to API Error: {e!s} - Details: {error_details}",
+            }
+        except Exception as e:
+            logger.error("General error: %s", e)
+            return {
+                "success": False,
+                "error": str(e),
+            }
 
     async def get_my_articles(self, per_page: int = 10) -> dict[str, Any]:
         """Get user's published articles"""
-
-        def _sync_get_articles():
-            try:
-                headers = {
-                    "api-key": self.api_key,
-                }
-
-                response = requests.get(
-                    f"{self.base_url}/articles/me/published?per_page={per_page}",
-                    headers=headers,
-                    timeout=30,  # Add timeout
-                )
-                response.raise_for_status()
-                result = response.json()
-                return {"success": True, "articles": result}
-            except Exception as e:
-                return {"success": False, "error": str(e)}
-
-        # Run the synchronous function in a thread pool
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _sync_get_articles)
+        try:
+            headers = {
+                "api-key": self.get_api_key(),
+            }
+
+            response = await self._get_client().get(
+                "/articles/me/published",
+                params={"per_page": per_page},
+                headers=headers,
+            )
+            response.raise_for_status()
+            result = response.json()
+            return {"success": True, "articles": result}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
 
 
 devto_service = DevToService()
@@ -1,82 +1,179 @@
 import asyncio
 import base64
+import functools
+import hashlib
+import re
 from pathlib import Path
 
-import aiofiles
 from openai import AsyncOpenAI
 
 from app.config.settings import settings
 from app.models.schemas import PaperAnalysis
 
+# Characters stripped from titles when building filenames - one C-level
+# substitution instead of a per-character Python generator
+_SAFE_TITLE_RE = re.compile(r"[^A-Za-z0-9 _-]+")
+
+
+def _safe_title(title: str, n: int = 50) -> str:
+    """Sanitize a paper title into a filename-safe slug"""
+    return _SAFE_TITLE_RE.sub("", title).rstrip().replace(" ", "_")[:n]
+
+
+@functools.lru_cache(maxsize=4)
+def _load_font(path: str, size: int):
+    """Load a truetype font once per (path, size), falling back to default"""
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.truetype(path, size)
+    except Exception:
+        return ImageFont.load_default()
+
+
+# Invariant prompt text kept up front as a module constant: providers cache
+# and discount a shared prefix, and Python doesn't rebuild it per call. The
+# paper fields and target platform go in the user turn at the end.
+_IMAGE_PROMPT_RULES = """You are an expert in creating visual prompts for AI image generation.
+Create a detailed visual prompt for DALL-E to generate an image that represents a research paper for social media.
+
+Requirements for the visual prompt:
+1. Create a modern, professional, and visually appealing image
+2. The image should represent the core concept/findings of the research
+3. Use abstract or symbolic representations rather than literal interpretations
+4. Include visual elements that would work well for the target platform
+5. Avoid text in the image (it will be added separately)
+6. Make it suitable for the target platform's audience
+7. Use scientific/academic visual themes if appropriate
+8. Consider color psychology for engagement
+
+Choose the correct set of colors and visual elements that align with the research topic and findings.
+Consider the following aspects:
+- Use colors that evoke trust and professionalism (e.g., blues, greens)
+- Include abstract representations of key findings (e.g., graphs, charts, symbols)
+- Use modern design elements (e.g., gradients, geometric shapes)
+
+You can also include some text elements in the image, but keep them minimal and relevant to the research.
+
+Platform-specific considerations:
+- LinkedIn: Professional, clean, business-appropriate
+- Twitter: Eye-catching, modern, tech-focused
+- Facebook: Engaging, accessible, community-friendly
+- Instagram: Vibrant, aesthetic, visual-first
+
+Generate a detailed image generation prompt for stable diffusion (max 800 characters) that will create an engaging image for this research."""
+
 
 class ImageGenerationService:
     def __init__(self):
         # Don't initialize client here, create it on-demand to get current API key
         self.output_dir = Path("outputs/images")
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Generated prompts keyed by paper+platform digest - rerunning the
+        # same paper reuses the prompt instead of another heavy-model call
+        self._prompt_cache: dict[str, str] = {}
+        # Shared client, rebuilt only when the runtime key override changes
+        self._client: AsyncOpenAI | None = None
+        self._client_key: str | None = None
+        # Bound concurrent generations so we don't trip provider rate limits
+        self._img_sema = asyncio.Semaphore(settings.IMAGE_GEN_CONCURRENCY)
+        # In-flight prompt generations, so concurrent duplicates share one call
+        self._inflight: dict[str, asyncio.Future] = {}
+        # Rendered paper-details blocks keyed by content digest, so the
+        # attribute reads and joins happen once per paper, not per platform
+        self._details_cache: dict[str, str] = {}
 
     def get_client(self):
         """Get OpenAI client with current API key (supports runtime overrides)"""
         api_key = settings.IMAGE_GEN_API_KEY_CURRENT
         if not api_key:
             raise ValueError("Image generation API key not configured")
-        return AsyncOpenAI(api_key=api_key, base_url=settings.IMAGE_GEN_BASE_URL)
+        if self._client is None or self._client_key != api_key:
+            self._client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=settings.IMAGE_GEN_BASE_URL,
+            )
+            self._client_key = api_key
+        return self._client
 
     async def generate_image_prompt(
         self,
         analysis: PaperAnalysis,
-        platform: str,
+        platform: str = "base",
     ) -> str:
         """Generate a visual prompt for the research paper using LLM"""
-        prompt_generation_prompt = f"""
-        You are an expert in creating visual prompts for AI image generation. 
-        Create a detailed visual prompt for DALL-E to generate an image that represents this research paper for {platform.upper()} social media.
-
-        Research Paper Details:
+        cache_key = hashlib.blake2b(
+            f"{analysis.title}|{analysis.abstract}|{platform}".encode(),
+            digest_size=16,
+        ).hexdigest()
+        cached = self._prompt_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Coalesce concurrent identical calls: later arrivals await the
+        # in-flight future instead of issuing a duplicate API request
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            return await inflight
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            image_prompt = await self._build_image_prompt(analysis, platform)
+            self._prompt_cache[cache_key] = image_prompt
+            future.set_result(image_prompt)
+            return image_prompt
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so abandoned waiters don't log a warning
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(cache_key, None)
+
+    async def _build_image_prompt(
+        self,
+        analysis: PaperAnalysis,
+        platform: str,
+    ) -> str:
+        """Issue the actual LLM call behind generate_image_prompt"""
+        target = (
+            f"Target platform: {platform.upper()}"
+            if platform != "base"
+            else "Target platform: general social media (all platforms)"
+        )
+        # Content-digest key: an id()-based key can be recycled after the
+        # analysis is garbage-collected and would serve another paper's text
+        details_key = hashlib.blake2b(
+            f"{analysis.title}|{analysis.abstract}".encode(),
+            digest_size=16,
+        ).hexdigest()
+        details = self._details_cache.get(details_key)
+        if details is None:
+            details = f"""Research Paper Details:
         Title: {analysis.title}
         Abstract: {analysis.abstract}
         Key Findings: {", ".join(analysis.key_findings)}
         Methodology: {analysis.methodology}
         Results: {analysis.results}
         Technical Terms: {", ".join(analysis.technical_terms)}
-
-        Requirements for the visual prompt:
-        1. Create a modern, professional, and visually appealing image
-        2. The image should represent the core concept/findings of the research
-        3. Use abstract or symbolic representations rather than literal interpretations
-        4. Include visual elements that would work well for {platform.upper()}
-        5. Avoid text in the image (it will be added separately)
-        6. Make it suitable for a {platform} audience
-        7. Use scientific/academic visual themes if appropriate
-        8. Consider color psychology for engagement
-
-        Choose the correct set of colors and visual elements that align with the research topic and findings.
-        Consider the following aspects:
-        - Use colors that evoke trust and professionalism (e.g., blues, greens)
-        - Include abstract representations of key findings (e.g., graphs, charts, symbols)
-        - Use modern design elements (e.g., gradients, geometric shapes)
-
-        You can also include some text elements in the image, but keep them minimal and relevant to the research.
-
-        Platform-specific considerations:
-        - LinkedIn: Professional, clean, business-appropriate
-        - Twitter: Eye-catching, modern, tech-focused
-        - Facebook: Engaging, accessible, community-friendly
-        - Instagram: Vibrant, aesthetic, visual-first
-
-        Generate a detailed image generation prompt for stable diffusion (max 800 characters) that will create an engaging image for this research:
         """
+            if len(self._details_cache) >= 64:
+                self._details_cache.pop(next(iter(self._details_cache)))
+            self._details_cache[details_key] = details
+        paper_details = f"{target}\n\n        {details}"
 
-        from app.services.llm_service import LLMService
-
-        llm_service = LLMService()
+        # Module singleton (as in base_agent) so the per-instance client
+        # cache and request semaphore actually persist across calls
+        from app.services.llm_service import llm_service
 
         messages = [
             {
                 "role": "system",
-                "content": "You are an expert visual designer and prompt engineer specializing in creating engaging scientific and academic imagery.",
+                "content": "You are an expert visual designer and prompt engineer specializing in creating engaging scientific and academic imagery.\n\n"
+                + _IMAGE_PROMPT_RULES,
             },
-            {"role": "user", "content": prompt_generation_prompt},
+            {"role": "user", "content": paper_details},
         ]
 
         image_prompt = await llm_service.generate_completion(
@@ -92,30 +189,48 @@ class ImageGenerationService:
 
         return image_prompt
 
+    async def generate_base_prompt(self, analysis: PaperAnalysis) -> str:
+        """Generate one platform-agnostic visual prompt for the paper"""
+        return await self.generate_image_prompt(analysis, "base")
+
     async def generate_social_media_image(
         self,
         analysis: PaperAnalysis,
         platform: str,
         style: str = settings.IMAGE_GEN_IMAGE_STYLE,
+        base_prompt: str | None = None,
     ) -> str | None:
         """Generate an image for social media post using Image Generation model"""
         try:
-            # Generate the image prompt using LLM
-            image_prompt = await self.generate_image_prompt(analysis, platform)
+            # Create filename based on paper title and platform; the saved PNG
+            # doubles as a disk cache, so a rerun of the same paper skips both
+            # the prompt LLM call and the image generation
+            filename = f"{_safe_title(analysis.title)}_{platform}.png"
+            image_path = self.output_dir / filename
+            if image_path.exists():
+                return str(image_path)
+
+            # Use the shared base prompt when the caller provides one; the
+            # per-platform LLM call is only needed for standalone requests
+            image_prompt = base_prompt or await self.generate_image_prompt(
+                analysis,
+                platform,
+            )
 
             # Add platform-specific styling to the prompt
             styled_prompt = f"{image_prompt}, {platform} social media style, professional, high quality, digital art"
 
             # Generate image using Image Generation model
             client = self.get_client()
-            response = await client.images.generate(
-                model=settings.IMAGE_GEN_MODEL,
-                prompt=styled_prompt,
-                size=settings.IMAGE_GEN_IMAGE_SIZE,
-                quality=settings.IMAGE_GEN_IMAGE_QUALITY,
-                style=style,
-                n=1,
-            )
+            async with self._img_sema:
+                response = await client.images.generate(
+                    model=settings.IMAGE_GEN_MODEL,
+                    prompt=styled_prompt,
+                    size=settings.IMAGE_GEN_IMAGE_SIZE,
+                    quality=settings.IMAGE_GEN_IMAGE_QUALITY,
+                    style=style,
+                    n=1,
+                )
 
             # Download and save the image
             # image_url = response.data[0].url
@@ -138,16 +253,11 @@ class ImageGenerationService:
 
             #                 return str(image_path)
             base64_data = response.data[0].b64_json
-            image_data = base64.b64decode(base64_data)
-            # Create filename based on paper title and platform
-            safe_title = "".join(
-                c for c in analysis.title if c.isalnum() or c in (" ", "-", "_")
-            ).rstrip()
-            safe_title = safe_title.replace(" ", "_")[:50]  # Limit length
-            filename = f"{safe_title}_{platform}.png"
-            image_path = self.output_dir / filename
-            async with aiofiles.open(image_path, "wb") as f:
-                await f.write(image_data)
+            # One-shot decode and write on a worker thread: keeps the CPU
+            # decode off the event loop and is a single syscall, without the
+            # aiofiles open/write/close threadpool round-trips
+            image_data = await asyncio.to_thread(base64.b64decode, base64_data)
+            await asyncio.to_thread(image_path.write_bytes, image_data)
             return str(image_path)
 
             # return None
@@ -161,9 +271,13 @@ class ImageGenerationService:
         platforms = ["linkedin", "twitter", "facebook", "instagram"]
         results = {}
 
+        # One heavy-model call for the base prompt, then per-platform styling
+        # happens inside each image task - 4 LLM calls collapse into 1
+        base_prompt = await self.generate_base_prompt(analysis)
+
         # Generate images concurrently for better performance
         tasks = [
-            self.generate_social_media_image(analysis, platform)
+            self.generate_social_media_image(analysis, platform, base_prompt=base_prompt)
             for platform in platforms
         ]
 
@@ -184,10 +298,20 @@ class ImageGenerationService:
         platform: str,
     ) -> str:
         """Create a simple text-based fallback image if DALL-E fails"""
+        # PIL rendering is synchronous CPU work (~50-100ms); run it on a
+        # worker thread so it doesn't stall the event loop
+        return await asyncio.to_thread(self._render_fallback_image, analysis, platform)
+
+    def _render_fallback_image(
+        self,
+        analysis: PaperAnalysis,
+        platform: str,
+    ) -> str:
+        """Synchronous PIL rendering body for create_simple_fallback_image"""
         try:
             import textwrap
 
-            from PIL import Image, ImageDraw, ImageFont
+            from PIL import Image, ImageDraw
 
             # Create a simple image with the paper title
             img = Image.new(
@@ -197,19 +321,15 @@ class ImageGenerationService:
             )  # Nice blue background
             draw = ImageDraw.Draw(img)
 
-            # Try to use a nice font, fallback to default
-            try:
-                font = ImageFont.truetype(
-                    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-                    48,
-                )
-                title_font = ImageFont.truetype(
-                    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-                    36,
-                )
-            except:
-                font = ImageFont.load_default()
-                title_font = ImageFont.load_default()
+            # Fonts are loaded once and cached across calls
+            font = _load_font(
+                "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+                48,
+            )
+            title_font = _load_font(
+                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+                36,
+            )
 
             # Wrap the title text
             title_lines = textwrap.wrap(analysis.title, width=30)
@@ -236,14 +356,10 @@ class ImageGenerationService:
             )  # Golden color
 
             # Save the image
-            safe_title = "".join(
-                c for c in analysis.title if c.isalnum() or c in (" ", "-", "_")
-            ).rstrip()
-            safe_title = safe_title.replace(" ", "_")[:50]
-            filename = f"{safe_title}_{platform}_fallback.png"
+            filename = f"{_safe_title(analysis.title)}_{platform}_fallback.png"
             image_path = self.output_dir / filename
 
-            img.save(image_path)
+            img.save(image_path, optimize=False, compress_level=1)
             return str(image_path)
 
         except Exception as e:
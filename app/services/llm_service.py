@@ -1,3 +1,5 @@
+import asyncio
+
 from openai import AsyncOpenAI
 
 from app.config.settings import settings
@@ -5,8 +7,11 @@ from app.config.settings import settings
 
 class LLMService:
     def __init__(self):
-        # Clients are now created on-demand in get_client
-        pass
+        # One client per model type; rebuilt only when the key or base URL
+        # changes so every completion reuses the pooled connections
+        self._clients: dict[str, tuple[str, str | None, AsyncOpenAI]] = {}
+        # Bound concurrent completions to stay under provider rate limits
+        self._llm_sema = asyncio.Semaphore(settings.LLM_CONCURRENCY)
 
     def get_client(self, model_type: str = "light"):
         """Get appropriate client based on model type"""
@@ -31,7 +36,11 @@ class LLMService:
                 f"API key for {model_type} model ({provider}) not configured.",
             )
 
-        return AsyncOpenAI(api_key=api_key, base_url=base_url), model_name
+        cached = self._clients.get(model_type)
+        if cached is None or cached[0] != api_key or cached[1] != base_url:
+            cached = (api_key, base_url, AsyncOpenAI(api_key=api_key, base_url=base_url))
+            self._clients[model_type] = cached
+        return cached[2], model_name
 
     async def generate_completion(
         self,
@@ -44,12 +53,13 @@ class LLMService:
         client, model_name = self.get_client(model_type)
 
         try:
-            response = await client.chat.completions.create(
-                model=model_name,
-                messages=messages,
-                temperature=temperature,
-                # max_tokens=max_tokens,
-            )
+            async with self._llm_sema:
+                response = await client.chat.completions.create(
+                    model=model_name,
+                    messages=messages,
+                    temperature=temperature,
+                    # max_tokens=max_tokens,
+                )
             content = response.choices[0].message.content
             if content is None:
                 raise Exception("LLM returned None content")
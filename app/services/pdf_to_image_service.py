@@ -1,4 +1,9 @@
+import asyncio
+import atexit
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Optional
 
 try:
@@ -17,6 +22,30 @@ except ImportError:
 
 from PIL import Image
 
+# Persistent worker pool for the CPU-bound render+encode work; spawn context
+# avoids inheriting the event loop state into forked children
+_CPU_POOL = ProcessPoolExecutor(
+    max_workers=os.cpu_count(),
+    mp_context=multiprocessing.get_context("spawn"),
+)
+atexit.register(_CPU_POOL.shutdown)
+
+
+@lru_cache(maxsize=8)
+def _open_doc(pdf_path: str, mtime: float):
+    """Open (and keep) a parsed fitz document, keyed by path and mtime.
+
+    Consecutive page renders of the same PDF reuse the parsed structure
+    instead of re-parsing the whole file; the mtime key invalidates on
+    rewrite and the small cache bounds resident memory. Cached documents
+    are deliberately never closed mid-run - dropping the cache entry
+    releases them.
+    """
+    return fitz.open(pdf_path)
+
+
+atexit.register(_open_doc.cache_clear)
+
 
 class PDFToImageService:
     """Service to convert PDF files to images for analysis using Python packages"""
@@ -40,15 +69,22 @@ class PDFToImageService:
 
         """
         try:
-            if not os.path.exists(pdf_path):
-                print(f"PDF file not found: {pdf_path}")
-                return None
+            # No up-front exists() check; os.stat and the converters raise on
+            # a missing file and the error handler below reports it
 
-            # Generate output path if not provided
+            # Generate output path if not provided. The default name carries a
+            # cheap (size, mtime, max_width) key, so re-rendering the same
+            # unchanged PDF short-circuits to the existing PNG.
             if output_path is None:
+                stat = os.stat(pdf_path)
                 pdf_dir = os.path.dirname(pdf_path)
                 pdf_name = os.path.splitext(os.path.basename(pdf_path))[0]
-                output_path = os.path.join(pdf_dir, f"{pdf_name}_image.png")
+                output_path = os.path.join(
+                    pdf_dir,
+                    f"{pdf_name}_image_{stat.st_size}_{int(stat.st_mtime)}_{max_width}.png",
+                )
+                if os.path.exists(output_path):
+                    return output_path
 
             # Try PyMuPDF first (faster and lighter)
             if PYMUPDF_AVAILABLE:
@@ -86,9 +122,26 @@ class PDFToImageService:
         max_width: int,
     ) -> bool:
         """Convert using PyMuPDF (fitz) - fast and lightweight"""
+        # Rendering is CPU-bound and holds the GIL for most of its runtime;
+        # the process pool lets concurrent papers rasterize in parallel
+        return await asyncio.get_running_loop().run_in_executor(
+            _CPU_POOL,
+            PDFToImageService._pymupdf_sync,
+            pdf_path,
+            output_path,
+            max_width,
+        )
+
+    @staticmethod
+    def _pymupdf_sync(
+        pdf_path: str,
+        output_path: str,
+        max_width: int,
+    ) -> bool:
+        """Synchronous PyMuPDF conversion body"""
         try:
-            # Open PDF document
-            doc = fitz.open(pdf_path)
+            # Open PDF document through the parse cache
+            doc = _open_doc(pdf_path, os.path.getmtime(pdf_path))
 
             if len(doc) == 0:
                 print("PDF has no pages")
@@ -107,12 +160,14 @@ class PDFToImageService:
             # Render page to pixmap
             pix = page.get_pixmap(matrix=mat, alpha=False)
 
-            # Save as PNG
-            pix.save(output_path)
-
-            # Clean up
-            doc.close()
+            # Encode as PNG in memory with light deflate (the image feeds a
+            # vision model, so default-level zlib effort buys nothing) and
+            # write the finished buffer with a single syscall
+            data = pix.pil_tobytes(format="PNG", compress_level=1, optimize=False)
+            with open(output_path, "wb") as f:
+                f.write(data)
 
+            # Document stays open in the parse cache for later page requests
             return True
 
         except Exception as e:
@@ -126,6 +181,21 @@ class PDFToImageService:
         max_width: int,
     ) -> bool:
         """Convert using pdf2image library"""
+        return await asyncio.get_running_loop().run_in_executor(
+            _CPU_POOL,
+            PDFToImageService._pdf2image_sync,
+            pdf_path,
+            output_path,
+            max_width,
+        )
+
+    @staticmethod
+    def _pdf2image_sync(
+        pdf_path: str,
+        output_path: str,
+        max_width: int,
+    ) -> bool:
+        """Synchronous pdf2image conversion body"""
         try:
             # Calculate DPI to achieve desired width
             # Standard A4 width is ~8.27 inches, so DPI = max_width / 8.27
@@ -147,11 +217,16 @@ class PDFToImageService:
             # Get the first (and only) image
             image = images[0]
 
-            # Resize if still too wide
+            # Resize if still too wide - BILINEAR on purpose: the thumbnail
+            # feeds a vision model that downsamples again internally, so
+            # LANCZOS-grade sub-pixel sharpness is not observable downstream
             if image.width > max_width:
                 ratio = max_width / image.width
                 new_height = int(image.height * ratio)
-                image = image.resize((max_width, new_height), Image.Resampling.LANCZOS)
+                image = image.resize(
+                    (max_width, new_height),
+                    Image.Resampling.BILINEAR,
+                )
 
             # Save the image
             image.save(output_path, "PNG", optimize=True)
@@ -1,3 +1,4 @@
+import asyncio
 import os
 from pathlib import Path
 from typing import Optional
@@ -9,6 +10,13 @@ try:
 except ImportError:
     PYMUPDF_AVAILABLE = False
 
+try:
+    import pypdfium2 as pdfium
+
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
 try:
     import pdf2image
 
@@ -16,7 +24,10 @@ try:
 except ImportError:
     PDF2IMAGE_AVAILABLE = False
 
-from PIL import Image
+# Rasterization is CPU-bound; share the spawn-context pool (and the parsed-
+# document cache) with the poster converter so slide pages render in
+# parallel without oversubscribing cores or re-parsing per page
+from app.services.pdf_to_image_service import _CPU_POOL, _open_doc
 
 
 class PresentationPDFToImageService:
@@ -43,17 +54,24 @@ class PresentationPDFToImageService:
 
         """
         try:
-            if not os.path.exists(pdf_path):
-                print(f"PDF file not found: {pdf_path}")
-                return None
+            # No up-front exists() check: os.stat below and the converters
+            # themselves raise on a missing file, so the extra stat() only
+            # added a syscall and a TOCTOU window
 
-            # Generate output path if not provided
+            # Generate output path if not provided. The default name carries a
+            # cheap (size, mtime, page, max_width) key so re-analysis of the
+            # same unchanged deck short-circuits to the existing PNG.
             if output_path is None:
+                stat = os.stat(pdf_path)
                 pdf_dir = os.path.dirname(pdf_path)
                 pdf_name = os.path.splitext(os.path.basename(pdf_path))[0]
                 output_path = os.path.join(
-                    pdf_dir, f"{pdf_name}_slide_{page_number}.png"
+                    pdf_dir,
+                    f"{pdf_name}_slide_{page_number}"
+                    f"_{stat.st_size}_{int(stat.st_mtime)}_{max_width}.png",
                 )
+                if os.path.exists(output_path):
+                    return output_path
 
             # Try PyMuPDF first (faster and lighter)
             if PYMUPDF_AVAILABLE:
@@ -66,6 +84,18 @@ class PresentationPDFToImageService:
                 if success:
                     return output_path
 
+            # Next preference: direct PDFium bindings - no subprocess spawn
+            # and a much faster render path than poppler via pdf2image
+            if PDFIUM_AVAILABLE:
+                success = await PresentationPDFToImageService._convert_with_pdfium(
+                    pdf_path,
+                    page_number,
+                    output_path,
+                    max_width,
+                )
+                if success:
+                    return output_path
+
             # Fallback to pdf2image
             if PDF2IMAGE_AVAILABLE:
                 success = await PresentationPDFToImageService._convert_with_pdf2image(
@@ -95,19 +125,17 @@ class PresentationPDFToImageService:
     ) -> bool:
         """Convert specific page using PyMuPDF (fitz) - fast and lightweight"""
         try:
-            # Open PDF document
-            doc = fitz.open(pdf_path)
+            # Open PDF document through the shared parse cache
+            doc = _open_doc(pdf_path, os.path.getmtime(pdf_path))
 
             if len(doc) == 0:
                 print("PDF has no pages")
-                doc.close()
                 return False
 
             # Validate page number (convert to 0-based indexing)
             page_index = page_number - 1
             if page_index < 0 or page_index >= len(doc):
                 print(f"Page {page_number} is out of range. PDF has {len(doc)} pages.")
-                doc.close()
                 return False
 
             # Get the specified page
@@ -123,18 +151,68 @@ class PresentationPDFToImageService:
             # Render page to pixmap
             pix = page.get_pixmap(matrix=mat, alpha=False)
 
-            # Save as PNG
-            pix.save(output_path)
-
-            # Clean up
-            doc.close()
+            # Encode as PNG in memory with light deflate (the slide image
+            # only feeds the vision model, so maximum compression is wasted
+            # work) and write the finished buffer with a single syscall
+            data = pix.pil_tobytes(format="PNG", compress_level=1, optimize=False)
+            with open(output_path, "wb") as f:
+                f.write(data)
 
+            # Document stays open in the shared parse cache for later slides
             return True
 
         except Exception as e:
             print(f"PyMuPDF conversion error: {e}")
             return False
 
+    @staticmethod
+    async def _convert_with_pdfium(
+        pdf_path: str,
+        page_number: int,
+        output_path: str,
+        max_width: int,
+    ) -> bool:
+        """Convert specific page using pypdfium2 (direct PDFium bindings)"""
+        return await asyncio.to_thread(
+            PresentationPDFToImageService._pdfium_sync,
+            pdf_path,
+            page_number,
+            output_path,
+            max_width,
+        )
+
+    @staticmethod
+    def _pdfium_sync(
+        pdf_path: str,
+        page_number: int,
+        output_path: str,
+        max_width: int,
+    ) -> bool:
+        """Synchronous PDFium conversion body"""
+        try:
+            pdf = pdfium.PdfDocument(pdf_path)
+            try:
+                if not 1 <= page_number <= len(pdf):
+                    print(
+                        f"Page {page_number} is out of range. PDF has {len(pdf)} pages."
+                    )
+                    return False
+                page = pdf[page_number - 1]
+                scale = min(max_width / page.get_width(), 2.0)
+                page.render(scale=scale).to_pil().save(
+                    output_path,
+                    "PNG",
+                    optimize=False,
+                    compress_level=1,
+                )
+            finally:
+                pdf.close()
+            return True
+
+        except Exception as e:
+            print(f"PDFium conversion error: {e}")
+            return False
+
     @staticmethod
     async def _convert_with_pdf2image(
         pdf_path: str,
@@ -144,9 +222,13 @@ class PresentationPDFToImageService:
     ) -> bool:
         """Convert specific page using pdf2image library"""
         try:
-            # Calculate DPI to achieve desired width
-            # Standard A4 width is ~8.27 inches, so DPI = max_width / 8.27
-            target_dpi = min(int(max_width / 8.27), 150)  # Max 150 DPI
+            # Calculate DPI from the actual page width so the render comes
+            # out at the target size directly - no post-resize needed
+            width_inches = PresentationPDFToImageService._page_width_inches(
+                pdf_path,
+                page_number,
+            )
+            target_dpi = min(int(max_width / width_inches), 150)  # Max 150 DPI
 
             # Convert specific page only
             images = pdf2image.convert_from_path(
@@ -161,17 +243,13 @@ class PresentationPDFToImageService:
                 print(f"No images generated from PDF page {page_number}")
                 return False
 
-            # Get the first (and only) image
+            # Get the first (and only) image - already at the target width,
+            # so the old LANCZOS resample is gone
             image = images[0]
 
-            # Resize if still too wide
-            if image.width > max_width:
-                ratio = max_width / image.width
-                new_height = int(image.height * ratio)
-                image = image.resize((max_width, new_height), Image.Resampling.LANCZOS)
-
-            # Save the image
-            image.save(output_path, "PNG", optimize=True)
+            # Save the image - skip the optimize pass; the PNG never leaves
+            # local disk and only feeds the vision model
+            image.save(output_path, "PNG", compress_level=1, optimize=False)
 
             return True
 
@@ -179,12 +257,33 @@ class PresentationPDFToImageService:
             print(f"pdf2image conversion error: {e}")
             return False
 
+    @staticmethod
+    def _page_width_inches(pdf_path: str, page_number: int) -> float:
+        """Best-effort actual page width in inches (A4 if unreadable)"""
+        try:
+            if PDFIUM_AVAILABLE:
+                pdf = pdfium.PdfDocument(pdf_path)
+                try:
+                    if 1 <= page_number <= len(pdf):
+                        return pdf[page_number - 1].get_width() / 72.0
+                finally:
+                    pdf.close()
+            elif PYMUPDF_AVAILABLE:
+                doc = _open_doc(pdf_path, os.path.getmtime(pdf_path))
+                if 1 <= page_number <= len(doc):
+                    return doc[page_number - 1].rect.width / 72.0
+        except Exception:
+            pass
+        return 8.27
+
     @staticmethod
     async def get_available_converters() -> list[str]:
         """Get list of available PDF conversion methods"""
         available = []
         if PYMUPDF_AVAILABLE:
             available.append("PyMuPDF")
+        if PDFIUM_AVAILABLE:
+            available.append("pypdfium2")
         if PDF2IMAGE_AVAILABLE:
             available.append("pdf2image")
         return available
@@ -215,18 +314,98 @@ class PresentationPDFToImageService:
         # Ensure output directory exists
         Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-        results = {}
         pdf_name = os.path.splitext(os.path.basename(pdf_path))[0]
-
-        for page_num in page_numbers:
-            output_path = os.path.join(output_dir, f"{pdf_name}_slide_{page_num}.png")
-            image_path = await PresentationPDFToImageService.convert_pdf_to_image(
-                pdf_path=pdf_path,
-                page_number=page_num,
-                output_path=output_path,
-                max_width=max_width,
+        targets = {
+            page_num: os.path.join(output_dir, f"{pdf_name}_slide_{page_num}.png")
+            for page_num in page_numbers
+        }
+
+        # Split the requested pages across process-pool workers; each worker
+        # opens its own document handle (PyMuPDF documents can't be shared
+        # across processes) and renders its slice of pages from it
+        if PYMUPDF_AVAILABLE and targets:
+            n_groups = min(len(targets), os.cpu_count() or 1)
+            items = list(targets.items())
+            groups = [dict(items[i::n_groups]) for i in range(n_groups)]
+            loop = asyncio.get_running_loop()
+            parts = await asyncio.gather(
+                *[
+                    loop.run_in_executor(
+                        _CPU_POOL,
+                        PresentationPDFToImageService._render_pages_sync,
+                        pdf_path,
+                        group,
+                        max_width,
+                    )
+                    for group in groups
+                ],
             )
-            results[page_num] = image_path
+            results = {}
+            for part in parts:
+                results.update(part)
+        else:
+            results = dict.fromkeys(page_numbers)
+
+        # Fall back to the single-page path for anything that failed, all
+        # pages concurrently - the pdf2image branch overlaps its poppler
+        # subprocesses instead of waiting on them one by one
+        failed = [page_num for page_num, path in results.items() if path is None]
+        if failed:
+            retried = await asyncio.gather(
+                *[
+                    PresentationPDFToImageService.convert_pdf_to_image(
+                        pdf_path=pdf_path,
+                        page_number=page_num,
+                        output_path=targets[page_num],
+                        max_width=max_width,
+                    )
+                    for page_num in failed
+                ],
+                return_exceptions=True,
+            )
+            for page_num, path in zip(failed, retried):
+                results[page_num] = path if not isinstance(path, Exception) else None
+
+        return results
+
+    @staticmethod
+    def _render_pages_sync(
+        pdf_path: str,
+        targets: dict[int, str],
+        max_width: int,
+    ) -> dict[int, Optional[str]]:
+        """Render several pages of one PDF with a shared PyMuPDF handle"""
+        results: dict[int, Optional[str]] = dict.fromkeys(targets)
+        try:
+            doc = fitz.open(pdf_path)
+        except Exception as e:
+            print(f"PyMuPDF batch conversion error: {e}")
+            return results
+
+        try:
+            for page_num, output_path in targets.items():
+                try:
+                    page_index = page_num - 1
+                    if page_index < 0 or page_index >= len(doc):
+                        print(
+                            f"Page {page_num} is out of range. PDF has {len(doc)} pages."
+                        )
+                        continue
+                    page = doc[page_index]
+                    zoom = min(max_width / page.rect.width, 2.0)
+                    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                    data = pix.pil_tobytes(
+                        format="PNG",
+                        compress_level=1,
+                        optimize=False,
+                    )
+                    with open(output_path, "wb") as f:
+                        f.write(data)
+                    results[page_num] = output_path
+                except Exception as e:
+                    print(f"PyMuPDF conversion error on page {page_num}: {e}")
+        finally:
+            doc.close()
 
         return results
 
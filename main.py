@@ -1,109 +1,331 @@
 import asyncio
+import functools
+import hashlib
+import logging
+import string
+import time
 from pathlib import Path
 
+import aiofiles
 import gradio as gr
 from gradio_pdf import PDF
 
-from app.agents.blog_generator import BlogGeneratorAgent
-from app.agents.paper_analyzer import PaperAnalyzerAgent
-from app.agents.poster_generator import PosterGeneratorAgent
-from app.agents.presentation_generator import PresentationGeneratorAgent
-from app.agents.tldr_generator import TLDRGeneratorAgent
 from app.config.settings import settings
 from app.models.schemas import PaperInput
 from app.services.devto_service import devto_service
-from app.services.pdf_service import pdf_service
+from app.utils.helpers import generate_content_hash
 from app.models.schemas import PresentationOutput
 
-# Initialize agents
-paper_analyzer = PaperAnalyzerAgent()
-blog_generator = BlogGeneratorAgent()
-tldr_generator = TLDRGeneratorAgent()
-poster_generator = PosterGeneratorAgent()
-presentation_generator = PresentationGeneratorAgent()
+logger = logging.getLogger(__name__)
 
-# Global state - Consider refactoring to avoid globals if possible
-current_analysis: dict | None = None
-current_blog: dict | None = None
-current_tldr: dict | None = None
-current_poster: dict | None = None
-current_presentation: dict | None = None
+# Completed analyses keyed by content hash - re-analyzing an identical
+# paper is an expensive LLM round-trip, so repeat submissions hit here
+_analysis_cache: dict[str, object] = {}
+_ANALYSIS_CACHE_MAX = 64
 
 
-async def process_paper(pdf_file, url_input, progress=None):
+def _cache_analysis(key: str, analysis: object) -> None:
+    """Insert into the analysis cache, evicting the oldest entries past the cap.
+
+    Every insert (content key and raw-input alias alike) goes through
+    here so the cache stays bounded no matter how many keys point at one
+    analysis.
+    """
+    if key not in _analysis_cache:
+        while len(_analysis_cache) >= _ANALYSIS_CACHE_MAX:
+            _analysis_cache.pop(next(iter(_analysis_cache)))
+    _analysis_cache[key] = analysis
+
+# In-flight analyses keyed by raw-input hash - a second identical
+# submission arriving while the first is still parsing joins its future
+# instead of launching a duplicate OCR + LLM pipeline
+_inflight: dict[str, asyncio.Future] = {}
+
+
+async def _join_or_claim(input_key: str):
+    """Join an in-flight analysis of the same input, or claim ownership.
+
+    Returns (analysis, None) when another request for this input was
+    already running (a None analysis means that request failed and the
+    caller should do its own work), or (None, future) when this request
+    is the first: it owns the future and must resolve it on every exit
+    path so joined requests don't wait forever.
+    """
+    inflight = _inflight.get(input_key)
+    if inflight is not None:
+        return await inflight, None
+    future = asyncio.get_running_loop().create_future()
+    _inflight[input_key] = future
+    return None, future
+
+# Agents (and the heavy SDK modules their packages pull in) are imported
+# and constructed lazily on first use so Gradio startup doesn't pay for
+# pipelines the user never opens; lru_cache makes each a singleton
+@functools.lru_cache(maxsize=None)
+def get_paper_analyzer():
+    from app.agents.paper_analyzer import PaperAnalyzerAgent
+
+    return PaperAnalyzerAgent()
+
+
+@functools.lru_cache(maxsize=None)
+def get_blog_generator():
+    from app.agents.blog_generator import BlogGeneratorAgent
+
+    return BlogGeneratorAgent()
+
+
+@functools.lru_cache(maxsize=None)
+def get_tldr_generator():
+    from app.agents.tldr_generator import TLDRGeneratorAgent
+
+    return TLDRGeneratorAgent()
+
+
+@functools.lru_cache(maxsize=None)
+def get_poster_generator():
+    from app.agents.poster_generator import PosterGeneratorAgent
+
+    return PosterGeneratorAgent()
+
+
+@functools.lru_cache(maxsize=None)
+def get_presentation_generator():
+    from app.agents.presentation_generator import PresentationGeneratorAgent
+
+    return PresentationGeneratorAgent()
+
+
+@functools.lru_cache(maxsize=None)
+def get_pdf_service():
+    # Deferred so importing main.py doesn't load the Mistral SDK
+    from app.services.pdf_service import pdf_service
+
+    return pdf_service
+
+@functools.lru_cache(maxsize=None)
+def _ensure_dir(path: str) -> None:
+    """Create an output directory once; cached so re-imports skip the syscalls."""
+    Path(path).mkdir(parents=True, exist_ok=True)
+
+
+# Output directories - ensured at import so reload/pytest imports work too
+for _dir in ("outputs/posters", "outputs/blogs", "outputs/presentations", "data"):
+    _ensure_dir(_dir)
+
+
+# Hidden-state sentinel updates shared by the "no analysis yet" and error
+# branches - Gradio only reads these when building the update payload, so
+# one instance serves every render instead of re-running __init__ per call
+_HIDDEN_PDF = PDF(visible=False)
+_HIDDEN_DOWNLOAD = gr.DownloadButton(visible=False)
+_HIDDEN_IMAGE = gr.Image(visible=False)
+
+
+# API-key textbox specs for the Configuration tab - built in a loop so
+# adding a provider is one line and component construction stays compact
+_KEY_PLACEHOLDER = "Enter key to override environment variable..."
+_MODEL_KEY_SPECS = [
+    ("heavy_model", "Heavy Model API Key (GPT-4, etc.)"),
+    ("light_model", "Light Model API Key (GPT-4-mini/nano, etc.)"),
+    ("coding_model", "Coding Model API Key (Claude)"),
+    ("mistral", "Mistral API Key"),
+]
+
+
+# Markdown templates - parsed once at import instead of per handler call
+_SUMMARY_TMPL = string.Template(
+    """# Paper Analysis Summary
+
+## **Title:** $title
+
+## **Authors:** $authors
+
+## **Abstract:**
+$abstract
+
+## **Methodology:**
+$methodology
+
+## **Key Findings:**
+$findings
+
+## **Results:**
+$results
+
+## **Conclusion:**
+$conclusion
+
+## **Complexity Level:** $complexity
+
+## **Technical Terms:**
+$technical_terms
+
+## **Figures and Tables:**
+$figures
+
+---
+*Generated by ScholarShare - AI Research Dissemination Platform*
+""",
+)
+
+_BLOG_PREVIEW_TMPL = string.Template(
+    """# $title
+
+$content
+
+**Tags:** $tags
+**Reading Time:** $reading_time minutes""",
+)
+
+_BLOG_MD_TMPL = string.Template(
+    """# $title
+
+$content
+
+---
+
+**Tags:** $tags
+**Reading Time:** $reading_time minutes
+**Meta Description:** $meta_description
+
+---
+*Generated by ScholarShare - AI Research Dissemination Platform*
+""",
+)
+
+
+def _render_analysis_md(analysis) -> str:
+    """Render the analysis summary markdown once, shared by preview and download."""
+    figures = (
+        "\n".join(
+            f"- {fig.get('description', 'Figure/Table')}: {fig.get('caption', 'No caption')}"
+            for fig in analysis.figures_tables
+        )
+        if analysis.figures_tables
+        else "None identified"
+    )
+    return _SUMMARY_TMPL.substitute(
+        title=analysis.title,
+        authors=", ".join(analysis.authors),
+        abstract=analysis.abstract,
+        methodology=analysis.methodology,
+        findings="\n".join(f"• {finding}" for finding in analysis.key_findings),
+        results=analysis.results,
+        conclusion=analysis.conclusion,
+        complexity=analysis.complexity_level.title(),
+        technical_terms=(
+            ", ".join(analysis.technical_terms)
+            if analysis.technical_terms
+            else "None identified"
+        ),
+        figures=figures,
+    )
+
+
+async def process_paper(pdf_file, url_input, analysis, progress=None):
     """Process paper from various input sources."""
-    global current_analysis
     if progress is None:
         progress = gr.Progress()
 
+    owned_future = None
     try:
         progress(0.1, desc="Processing input...")
 
         # Determine input source and extract content
         if pdf_file is not None:
             progress(0.2, desc="Parsing PDF...")
-            # Replaced open() with Path.open() and async read
+            # Read the upload through aiofiles like the download handlers,
+            # instead of borrowing a default-executor thread per upload
             pdf_path = Path(pdf_file.name)
-            pdf_content = await asyncio.to_thread(pdf_path.read_bytes)
-            # TODO: Uncomment when PDF parsing is implemented
-            parsed_data = pdf_service.parse_pdf(pdf_content)
-            content = parsed_data["text"]
-            # Read the PDF content directly from file parsed_pdf_content.txt
-            # with open("parsed_pdf_content.txt", encoding="utf-8") as f:
-            #     content = f.read()
+            async with aiofiles.open(pdf_path, "rb") as f:
+                pdf_content = await f.read()
+            # Hash the raw upload first: an identical re-upload skips the
+            # OCR round-trip as well as the analysis
+            input_key = generate_content_hash(pdf_content)
+            cached = _analysis_cache.get(input_key)
+            if cached is None:
+                # Someone may be mid-analysis on this exact upload
+                cached, owned_future = await _join_or_claim(input_key)
+            if cached is None:
+                # TODO: Uncomment when PDF parsing is implemented
+                parsed_data = await get_pdf_service().parse_pdf(pdf_content)
+                content = parsed_data["text"]
+                # Read the PDF content directly from file parsed_pdf_content.txt
+                # with open("parsed_pdf_content.txt", encoding="utf-8") as f:
+                #     content = f.read()
             source_type = "pdf"
         elif url_input and url_input.strip():
             progress(0.2, desc="Fetching from URL...")
-            parsed_data = pdf_service.parse_url(url_input.strip())
-            content = parsed_data["text"]
+            input_key = generate_content_hash(url_input.strip())
+            cached = _analysis_cache.get(input_key)
+            if cached is None:
+                cached, owned_future = await _join_or_claim(input_key)
+            if cached is None:
+                parsed_data = await get_pdf_service().parse_url(url_input.strip())
+                content = parsed_data["text"]
             source_type = "url"
         elif text_input and text_input.strip():
             content = text_input.strip()
+            input_key = None
+            cached = None
             source_type = "text"
         else:
-            return "❌ Please provide a PDF file, URL, or text input.", "", "", ""
-
-        if not content or not content.strip():
-            return "❌ No content could be extracted from the input.", "", "", ""
-
-        # Create paper input
-        paper_input = PaperInput(content=content, source_type=source_type)
-
-        # Analyze paper
-        progress(0.4, desc="Analyzing paper...")
-        current_analysis = await paper_analyzer.process(paper_input)
-        print(current_analysis)  # Debugging line
-
-        # Generate preview content
-        progress(0.7, desc="Generating previews...")
-
-        analysis_summary = f"""
-# Paper Analysis Summary
-
-## **Title:** {current_analysis.title}
+            return (
+                "❌ Please provide a PDF file, URL, or text input.",
+                "",
+                "",
+                _HIDDEN_DOWNLOAD,
+                analysis,
+            )
 
-## **Authors:** {", ".join(current_analysis.authors)}
+        if cached is not None:
+            progress(1.0, desc="Complete!")
+            return (
+                "✅ Paper processed successfully!",
+                cached._rendered_md,
+                "Ready to generate blog content",
+                gr.DownloadButton(visible=True),
+                cached,
+            )
 
-## **Abstract:**
-{current_analysis.abstract}
+        if not content or not content.strip():
+            return (
+                "❌ No content could be extracted from the input.",
+                "",
+                "",
+                _HIDDEN_DOWNLOAD,
+                analysis,
+            )
 
-## **Methodology:**
-{current_analysis.methodology}
+        # Identical content (same PDF, URL, or text) reuses the finished
+        # analysis instead of paying the LLM round-trip again
+        cache_key = generate_content_hash(content)
+        analysis = _analysis_cache.get(cache_key)
+        if analysis is None:
+            # Create paper input
+            paper_input = PaperInput(content=content, source_type=source_type)
 
-## **Key Findings:**
-{chr(10).join([f"• {finding}" for finding in current_analysis.key_findings])}
+            # Analyze paper
+            progress(0.4, desc="Analyzing paper...")
+            analysis = await get_paper_analyzer().process(paper_input)
+            logger.debug("analysis=%s", analysis)
 
-## **Results:**
-{current_analysis.results}
+            # Generate preview content (rendered once, reused by the
+            # download handler and by cache hits)
+            progress(0.7, desc="Generating previews...")
+            analysis._rendered_md = _render_analysis_md(analysis)
 
-## **Conclusion:**
-{current_analysis.conclusion}
+            _cache_analysis(cache_key, analysis)
 
-## **Complexity Level:** {current_analysis.complexity_level.title()}
+        # Also alias the raw-input key so the next identical upload or URL
+        # short-circuits before parsing
+        if input_key is not None:
+            _cache_analysis(input_key, analysis)
+        if owned_future is not None:
+            owned_future.set_result(analysis)
 
-## **Technical Terms:**
-{", ".join(current_analysis.technical_terms) if current_analysis.technical_terms else "None identified"}
-        """
+        analysis_summary = analysis._rendered_md
 
         progress(1.0, desc="Complete!")
 
@@ -112,6 +334,7 @@ async def process_paper(pdf_file, url_input, progress=None):
             analysis_summary,
             "Ready to generate blog content",
             gr.DownloadButton(visible=True),
+            analysis,
         )
 
     except Exception as e:
@@ -120,47 +343,52 @@ async def process_paper(pdf_file, url_input, progress=None):
             f"❌ Error processing paper: {e!s}",
             "",
             "",
-            gr.DownloadButton(visible=False),
+            _HIDDEN_DOWNLOAD,
+            analysis,
         )
+    finally:
+        if owned_future is not None:
+            # Error paths resolve with None so joined requests retry on
+            # their own instead of waiting forever
+            if not owned_future.done():
+                owned_future.set_result(None)
+            _inflight.pop(input_key, None)
 
 
-async def generate_blog_content(progress=None):
+async def generate_blog_content(analysis, blog, progress=None):
     """Generate blog content from analysis."""
-    global current_analysis, current_blog
     if progress is None:
         progress = gr.Progress()
 
-    if not current_analysis:
+    if not analysis:
         return (
             "❌ Please process a paper first.",
             "",
-            gr.DownloadButton(visible=False),
+            _HIDDEN_DOWNLOAD,
+            blog,
         )
 
     try:
         progress(0.1, desc="Starting blog generation...")
-        await asyncio.sleep(0.5)  # Give time for progress bar to show
-
         progress(0.3, desc="Generating blog content...")
-        await asyncio.sleep(0.3)  # Allow UI to update
 
-        current_blog = await blog_generator.process(current_analysis)
+        blog = await get_blog_generator().process(analysis)
 
         progress(0.8, desc="Formatting blog content...")
-        await asyncio.sleep(0.3)  # Allow UI to update
-
-        blog_preview = f"""# {current_blog.title}
-
-{current_blog.content}
 
-**Tags:** {", ".join(current_blog.tags)}
-**Reading Time:** {current_blog.reading_time} minutes"""
+        blog_preview = _BLOG_PREVIEW_TMPL.substitute(
+            title=blog.title,
+            content=blog.content,
+            tags=", ".join(blog.tags),
+            reading_time=blog.reading_time,
+        )
 
         progress(1.0, desc="Blog content generated!")
         return (
             "✅ Blog content generated successfully!",
             blog_preview,
             gr.DownloadButton(visible=True),
+            blog,
         )
 
     except Exception as e:
@@ -168,63 +396,64 @@ async def generate_blog_content(progress=None):
         return (
             f"❌ Error generating blog: {e!s}",
             "",
-            gr.DownloadButton(visible=False),
+            _HIDDEN_DOWNLOAD,
+            blog,
         )
 
 
-async def generate_social_content(progress=None):
+def _img_update(image_path):
+    """Build a gr.Image update showing the image if available, hidden if not.
+
+    The value stays a file path on purpose: Gradio serves the existing PNG
+    as-is, whereas handing it a decoded PIL image would force a full
+    re-encode of every social image on each render.
+    """
+    return gr.Image(value=image_path, visible=bool(image_path))
+
+
+async def generate_social_content(analysis, tldr, progress=None):
     """Generate social media content from analysis."""
-    global current_analysis, current_tldr
     if progress is None:
         progress = gr.Progress()
 
-    if not current_analysis:
-        return "❌ Please process a paper first.", "", "", "", None, None, None, None
+    if not analysis:
+        return (
+            "❌ Please process a paper first.",
+            "",
+            "",
+            "",
+            None,
+            None,
+            None,
+            None,
+            tldr,
+        )
 
     try:
         progress(0.3, desc="Generating social media content...")
-        current_tldr = await tldr_generator.process(current_analysis)
+        tldr = await get_tldr_generator().process(analysis)
 
         progress(1.0, desc="Social content generated!")
 
-        # Prepare image updates - show image if available, hide if not
-        linkedin_img_update = gr.Image(
-            value=current_tldr.linkedin_image,
-            visible=bool(current_tldr.linkedin_image),
-        )
-        twitter_img_update = gr.Image(
-            value=current_tldr.twitter_image,
-            visible=bool(current_tldr.twitter_image),
-        )
-        facebook_img_update = gr.Image(
-            value=current_tldr.facebook_image,
-            visible=bool(current_tldr.facebook_image),
-        )
-        instagram_img_update = gr.Image(
-            value=current_tldr.instagram_image,
-            visible=bool(current_tldr.instagram_image),
-        )
-
         return (
-            current_tldr.linkedin_post,
+            tldr.linkedin_post,
             "\n\n".join(
-                [
-                    f"Tweet {i + 1}: {tweet}"
-                    for i, tweet in enumerate(current_tldr.twitter_thread)
-                ],
+                f"Tweet {i}: {tweet}"
+                for i, tweet in enumerate(tldr.twitter_thread, 1)
             ),
-            current_tldr.facebook_post,
-            current_tldr.instagram_caption,
-            linkedin_img_update,
-            twitter_img_update,
-            facebook_img_update,
-            instagram_img_update,
+            tldr.facebook_post,
+            tldr.instagram_caption,
+            _img_update(tldr.linkedin_image),
+            _img_update(tldr.twitter_image),
+            _img_update(tldr.facebook_image),
+            _img_update(tldr.instagram_image),
+            tldr,
         )
 
     except Exception as e:
         # Consider more specific exception handling
         error_msg = f"❌ Error generating social content: {e!s}"
-        hidden_img = gr.Image(visible=False)
+        hidden_img = _HIDDEN_IMAGE
         return (
             error_msg,
             error_msg,
@@ -234,28 +463,29 @@ async def generate_social_content(progress=None):
             hidden_img,
             hidden_img,
             hidden_img,
+            tldr,
         )
 
 
-async def generate_poster_content(template_type, orientation, progress=None):
+async def generate_poster_content(template_type, orientation, analysis, poster, progress=None):
     """Generate poster content from analysis."""
-    global current_analysis, current_poster
     if progress is None:
         progress = gr.Progress()
 
-    if not current_analysis:
+    if not analysis:
         return (
             "❌ Please process a paper first.",
             "",  # For latex_output
-            PDF(visible=False),  # For poster_pdf_preview
-            gr.DownloadButton(visible=False),  # For download_pdf_btn
-            gr.DownloadButton(visible=False),  # For download_latex_btn
+            _HIDDEN_PDF,  # For poster_pdf_preview
+            _HIDDEN_DOWNLOAD,  # For download_pdf_btn
+            _HIDDEN_DOWNLOAD,  # For download_latex_btn
+            poster,
         )
 
     try:
         progress(0.3, desc="Generating poster...")
-        current_poster = await poster_generator.process(
-            current_analysis,
+        poster = await get_poster_generator().process(
+            analysis,
             template_type,
             orientation,
         )
@@ -263,11 +493,11 @@ async def generate_poster_content(template_type, orientation, progress=None):
         progress(0.8, desc="Compiling LaTeX...")
 
         # Initialize updates for PDF preview and download button
-        pdf_preview_update = PDF(visible=False)
-        pdf_download_btn_update = gr.DownloadButton(visible=False)
+        pdf_preview_update = _HIDDEN_PDF
+        pdf_download_btn_update = _HIDDEN_DOWNLOAD
 
-        if current_poster.pdf_path and Path(current_poster.pdf_path).exists():
-            pdf_path_str = str(current_poster.pdf_path)
+        if poster.pdf_path and Path(poster.pdf_path).exists():
+            pdf_path_str = str(poster.pdf_path)
             pdf_preview_update = PDF(
                 value=pdf_path_str,
                 visible=True,
@@ -282,49 +512,57 @@ async def generate_poster_content(template_type, orientation, progress=None):
 
         # Get LaTeX download button update
         latex_download_btn_update = (
-            await download_latex_code()
+            await download_latex_code(poster)
         )  # This function already returns a DownloadButton update
 
         progress(1.0, desc="Poster ready!")
         return (
             "✅ Poster generated successfully!",  # For poster_status
-            current_poster.latex_code,  # For latex_output (string updates gr.Code value)
+            poster.latex_code,  # For latex_output (string updates gr.Code value)
             pdf_preview_update,  # For poster_pdf_preview (PDF component update)
             pdf_download_btn_update,  # For download_pdf_btn (DownloadButton component update)
             latex_download_btn_update,  # For download_latex_btn (DownloadButton component update)
+            poster,
         )
 
     except Exception as e:
         return (
             f"❌ Error generating poster: {e!s}",
             "",  # For latex_output
-            PDF(visible=False),  # For poster_pdf_preview
-            gr.DownloadButton(visible=False),  # For download_pdf_btn
-            gr.DownloadButton(visible=False),  # For download_latex_btn
+            _HIDDEN_PDF,  # For poster_pdf_preview
+            _HIDDEN_DOWNLOAD,  # For download_pdf_btn
+            _HIDDEN_DOWNLOAD,  # For download_latex_btn
+            poster,
         )
 
 
-async def generate_presentation_content(template_type, slide_count, progress=None):
+async def generate_presentation_content(
+    template_type,
+    slide_count,
+    analysis,
+    presentation,
+    progress=None,
+):
     """Generate presentation content from analysis."""
-    global current_analysis, current_presentation
     if progress is None:
         progress = gr.Progress()
 
-    if not current_analysis:
+    if not analysis:
         return (
             "❌ Please process a paper first.",
             "",  # For beamer_output
-            PDF(visible=False),  # For presentation_pdf_preview
-            gr.DownloadButton(visible=False),  # For download_presentation_pdf_btn
-            gr.DownloadButton(visible=False),  # For download_beamer_btn
+            _HIDDEN_PDF,  # For presentation_pdf_preview
+            _HIDDEN_DOWNLOAD,  # For download_presentation_pdf_btn
+            _HIDDEN_DOWNLOAD,  # For download_beamer_btn
+            presentation,
         )
 
     try:
         progress(0.2, desc="Planning presentation structure...")
 
         # Generate presentation using the PresentationGeneratorAgent
-        current_presentation = await presentation_generator.process(
-            current_analysis,
+        presentation = await get_presentation_generator().process(
+            analysis,
             template_type=template_type,
             max_slides=slide_count,
         )
@@ -332,14 +570,11 @@ async def generate_presentation_content(template_type, slide_count, progress=Non
         progress(0.8, desc="Compiling Beamer LaTeX...")
 
         # Initialize updates for PDF preview and download button
-        pdf_preview_update = PDF(visible=False)
-        pdf_download_btn_update = gr.DownloadButton(visible=False)
-
-        if (
-            current_presentation.pdf_path
-            and Path(current_presentation.pdf_path).exists()
-        ):
-            pdf_path_str = str(current_presentation.pdf_path)
+        pdf_preview_update = _HIDDEN_PDF
+        pdf_download_btn_update = _HIDDEN_DOWNLOAD
+
+        if presentation.pdf_path and Path(presentation.pdf_path).exists():
+            pdf_path_str = str(presentation.pdf_path)
             pdf_preview_update = PDF(
                 value=pdf_path_str,
                 visible=True,
@@ -347,8 +582,8 @@ async def generate_presentation_content(template_type, slide_count, progress=Non
             )
         ppt_download_btn_update = gr.DownloadButton(
             label="📥 Download PPTX",
-            value=str(current_presentation.ppt_path),
-            visible=bool(current_presentation.ppt_path),
+            value=str(presentation.ppt_path),
+            visible=bool(presentation.ppt_path),
         )
 
         # Get Beamer LaTeX download button update
@@ -357,35 +592,96 @@ async def generate_presentation_content(template_type, slide_count, progress=Non
         progress(1.0, desc="Presentation ready!")
         return (
             "✅ Presentation generated successfully!",
-            current_presentation.html_code,  # show raw HTML in Code component
+            presentation.html_code,  # show raw HTML in Code component
             pdf_preview_update,
             pdf_download_btn_update,
             ppt_download_btn_update,  # <-- NEW
+            presentation,
         )
 
     except Exception as e:
         return (
             f"❌ Error generating presentation: {e!s}",
             "",  # For beamer_output
-            PDF(visible=False),  # For presentation_pdf_preview
-            gr.DownloadButton(visible=False),  # For download_presentation_pdf_btn
-            gr.DownloadButton(visible=False),  # For download_beamer_btn
+            _HIDDEN_PDF,  # For presentation_pdf_preview
+            _HIDDEN_DOWNLOAD,  # For download_presentation_pdf_btn
+            _HIDDEN_DOWNLOAD,  # For download_beamer_btn
+            presentation,
         )
 
 
-async def publish_to_devto(publish_now):
-    """Publish blog content to DEV.to."""
-    global current_blog
+async def generate_all(
+    template_type,
+    orientation,
+    presentation_template,
+    slide_count,
+    analysis,
+    blog,
+    tldr,
+    poster,
+    presentation,
+    progress=None,
+):
+    """Generate blog, social, poster, and presentation content concurrently."""
+    if progress is None:
+        progress = gr.Progress()
+
+    progress(0.1, desc="Generating all content...")
 
-    if not current_blog:
+    # Each generator is an independent network-bound pipeline over the same
+    # analysis, so one gather makes total wall-clock max(latency) instead of
+    # sum(latency). The handlers catch their own exceptions and return their
+    # error tuples, so a failing tab doesn't take the others down.
+    blog_res, social_res, poster_res, presentation_res = await asyncio.gather(
+        generate_blog_content(analysis, blog, progress=progress),
+        generate_social_content(analysis, tldr, progress=progress),
+        generate_poster_content(
+            template_type,
+            orientation,
+            analysis,
+            poster,
+            progress=progress,
+        ),
+        generate_presentation_content(
+            presentation_template,
+            slide_count,
+            analysis,
+            presentation,
+            progress=progress,
+        ),
+    )
+
+    progress(1.0, desc="All content generated!")
+    return (*blog_res, *social_res, *poster_res, *presentation_res)
+
+
+# Recent successful publishes keyed by (content hash, publish flag) - a
+# double-click on Publish would otherwise create duplicate DEV.to drafts
+_publish_cache: dict[tuple[str, bool], tuple[float, str]] = {}
+_PUBLISH_TTL = 30.0
+
+
+async def publish_to_devto(blog, publish_now):
+    """Publish blog content to DEV.to."""
+    if not blog:
         return "❌ Please generate blog content first."
 
     try:
-        result = await devto_service.publish_article(current_blog, publish_now)
+        cache_key = (generate_content_hash(blog.content), publish_now)
+        cached = _publish_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < _PUBLISH_TTL:
+            return cached[1]
+
+        result = await devto_service.publish_article(blog, publish_now)
 
         if result["success"]:
             status = "Published" if result.get("published") else "Saved as Draft"
-            return f"✅ Article {status} successfully!\nURL: {result.get('url', 'N/A')}"
+            message = (
+                f"✅ Article {status} successfully!\nURL: {result.get('url', 'N/A')}"
+            )
+            # Only successes are cached - failures should retry immediately
+            _publish_cache[cache_key] = (time.monotonic(), message)
+            return message
         # Removed unnecessary else
         return f"❌ Publication failed: {result.get('error', 'Unknown error')}"
 
@@ -394,90 +690,42 @@ async def publish_to_devto(publish_now):
         return f"❌ Error publishing to DEV.to: {e!s}"
 
 
-def publish_draft():
-    """Sync wrapper for publishing as draft."""
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If loop is already running, create a task
-            import concurrent.futures
-
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, publish_to_devto(False))
-                return future.result()
-        else:
-            return loop.run_until_complete(publish_to_devto(False))
-    except RuntimeError:
-        # If no event loop, create one
-        return asyncio.run(publish_to_devto(False))
+async def publish_draft(blog):
+    """Publish the current blog to DEV.to as a draft."""
+    # Gradio awaits async handlers directly, so no executor/asyncio.run
+    # trampoline is needed - running on the app loop also keeps the
+    # devto_service HTTP connection pool warm between clicks
+    return await publish_to_devto(blog, False)
 
 
-def publish_now():
-    """Sync wrapper for publishing immediately."""
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If loop is already running, create a task
-            import concurrent.futures
-
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, publish_to_devto(True))
-                return future.result()
-        else:
-            return loop.run_until_complete(publish_to_devto(True))
-    except RuntimeError:
-        # If no event loop, create one
-        return asyncio.run(publish_to_devto(True))
+async def publish_now(blog):
+    """Publish the current blog to DEV.to immediately."""
+    return await publish_to_devto(blog, True)
 
 
-async def download_analysis_summary():
+async def download_analysis_summary(analysis):
     """Generate downloadable analysis summary as markdown file."""
-    global current_analysis
-
-    if not current_analysis:
+    if not analysis:
         return None
 
     try:
-        # Create comprehensive analysis summary
-        markdown_content = f"""# Paper Analysis Summary
-
-## Title
-{current_analysis.title}
-
-## Authors
-{", ".join(current_analysis.authors)}
-
-## Abstract
-{current_analysis.abstract}
-
-## Methodology
-{current_analysis.methodology}
-
-## Key Findings
-{chr(10).join([f"- {finding}" for finding in current_analysis.key_findings])}
-
-## Results
-{current_analysis.results}
-
-## Conclusion
-{current_analysis.conclusion}
-
-## Complexity Level
-{current_analysis.complexity_level.title()}
-
-## Technical Terms
-{", ".join(current_analysis.technical_terms) if current_analysis.technical_terms else "None identified"}
-
-## Figures and Tables
-{chr(10).join([f"- {fig.get('description', 'Figure/Table')}: {fig.get('caption', 'No caption')}" for fig in current_analysis.figures_tables]) if current_analysis.figures_tables else "None identified"}
-
----
-*Generated by ScholarShare - AI Research Dissemination Platform*
-"""
-
-        # Save to outputs directory
-        output_path = Path("outputs/analysis_summary.md")
-        output_path.write_text(markdown_content, encoding="utf-8")
+        # Reuse the markdown rendered during analysis instead of rebuilding it
+        markdown_content = getattr(
+            analysis,
+            "_rendered_md",
+            None,
+        ) or _render_analysis_md(analysis)
+
+        # Save to outputs directory, keyed by content hash so repeat clicks
+        # with an unchanged analysis skip the write entirely
+        digest = hashlib.blake2b(
+            markdown_content.encode(),
+            digest_size=8,
+        ).hexdigest()
+        output_path = Path(f"outputs/analysis_summary_{digest}.md")
+        if not output_path.exists():
+            async with aiofiles.open(output_path, "w", encoding="utf-8") as f:
+                await f.write(markdown_content)
 
         return str(output_path)
 
@@ -485,30 +733,31 @@ async def download_analysis_summary():
         return None
 
 
-async def download_blog_markdown():
+async def download_blog_markdown(blog):
     """Generate downloadable blog content as markdown file."""
-    if not current_blog:
+    if not blog:
         return None
 
     try:
         # Create comprehensive blog markdown
-        markdown_content = f"""# {current_blog.title}
-
-{current_blog.content}
-
----
-
-**Tags:** {", ".join(current_blog.tags)}
-**Reading Time:** {current_blog.reading_time} minutes
-**Meta Description:** {current_blog.meta_description}
-
----
-*Generated by ScholarShare - AI Research Dissemination Platform*
-"""
+        markdown_content = _BLOG_MD_TMPL.substitute(
+            title=blog.title,
+            content=blog.content,
+            tags=", ".join(blog.tags),
+            reading_time=blog.reading_time,
+            meta_description=blog.meta_description,
+        )
 
-        # Save to outputs directory
-        output_path = Path("outputs/blogs/blog_content.md")
-        output_path.write_text(markdown_content, encoding="utf-8")
+        # Save to outputs directory, keyed by content hash so repeat clicks
+        # with unchanged blog content skip the write entirely
+        digest = hashlib.blake2b(
+            markdown_content.encode(),
+            digest_size=8,
+        ).hexdigest()
+        output_path = Path(f"outputs/blogs/blog_content_{digest}.md")
+        if not output_path.exists():
+            async with aiofiles.open(output_path, "w", encoding="utf-8") as f:
+                await f.write(markdown_content)
 
         return str(output_path)
 
@@ -516,15 +765,18 @@ async def download_blog_markdown():
         return None
 
 
-async def download_latex_code():
+async def download_latex_code(poster):
     """Generate downloadable LaTeX code as a file."""
-    if not current_poster:
-        return gr.DownloadButton(visible=False)
+    if not poster:
+        return _HIDDEN_DOWNLOAD
 
     try:
-        # Save LaTeX code to outputs directory
+        # Save LaTeX code to outputs directory without blocking the loop;
+        # encode once up front and write binary, skipping the text-mode
+        # wrapper's incremental re-encoding of the multi-KB document
         output_path = Path("outputs/posters/poster_latex.tex")
-        output_path.write_text(current_poster.latex_code, encoding="utf-8")
+        async with aiofiles.open(output_path, "wb") as f:
+            await f.write(poster.latex_code.encode("utf-8"))
 
         return gr.DownloadButton(
             label="📥 Download LaTeX",
@@ -533,18 +785,20 @@ async def download_latex_code():
         )
 
     except OSError:
-        return gr.DownloadButton(visible=False)
+        return _HIDDEN_DOWNLOAD
 
 
-async def download_presentation_beamer():
+async def download_presentation_beamer(presentation):
     """Generate downloadable Beamer LaTeX code as a file."""
-    if not current_presentation:
-        return gr.DownloadButton(visible=False)
+    if not presentation:
+        return _HIDDEN_DOWNLOAD
 
     try:
-        # Save Beamer code to outputs directory
+        # Save Beamer code to outputs directory without blocking the loop;
+        # one up-front encode plus a binary write, as in download_latex_code
         output_path = Path("outputs/presentations/presentation_beamer.tex")
-        output_path.write_text(current_presentation.latex_code, encoding="utf-8")
+        async with aiofiles.open(output_path, "wb") as f:
+            await f.write(presentation.latex_code.encode("utf-8"))
 
         return gr.DownloadButton(
             label="📥 Download Beamer LaTeX",
@@ -553,7 +807,7 @@ async def download_presentation_beamer():
         )
 
     except OSError:
-        return gr.DownloadButton(visible=False)
+        return _HIDDEN_DOWNLOAD
 
 
 # Configuration functions
@@ -618,6 +872,13 @@ def create_interface():
         Transform complex research papers into accessible, multi-format content for broader audience engagement.
         """)
 
+        # Per-session state - keeps concurrent users from clobbering each other
+        analysis_state = gr.State()
+        blog_state = gr.State()
+        tldr_state = gr.State()
+        poster_state = gr.State()
+        presentation_state = gr.State()
+
         with gr.Tab("📄 Paper Input & Analysis"):
             gr.Markdown("## Upload and Analyze Research Paper")
 
@@ -639,6 +900,10 @@ def create_interface():
                     # )
 
                     process_btn = gr.Button("🔍 Analyze Paper", variant="primary")
+                    generate_all_btn = gr.Button(
+                        "🚀 Generate Everything",
+                        variant="secondary",
+                    )
 
                 with gr.Column():
                     status_output = gr.Textbox(label="Status", interactive=False)
@@ -865,26 +1130,14 @@ def create_interface():
             with gr.Row():
                 with gr.Column():
                     gr.Markdown("### Language Models")
-                    heavy_model_key_input = gr.Textbox(
-                        label="Heavy Model API Key (GPT-4, etc.)",
-                        type="password",
-                        placeholder="Enter key to override environment variable...",
-                    )
-                    light_model_key_input = gr.Textbox(
-                        label="Light Model API Key (GPT-4-mini/nano, etc.)",
-                        type="password",
-                        placeholder="Enter key to override environment variable...",
-                    )
-                    coding_model_key_input = gr.Textbox(
-                        label="Coding Model API Key (Claude)",
-                        type="password",
-                        placeholder="Enter key to override environment variable...",
-                    )
-                    mistral_key_input = gr.Textbox(
-                        label="Mistral API Key",
-                        type="password",
-                        placeholder="Enter key to override environment variable...",
-                    )
+                    key_inputs = {
+                        name: gr.Textbox(
+                            label=label,
+                            type="password",
+                            placeholder=_KEY_PLACEHOLDER,
+                        )
+                        for name, label in _MODEL_KEY_SPECS
+                    }
 
                 with gr.Column():
                     gr.Markdown("### Other Services")
@@ -901,7 +1154,7 @@ def create_interface():
                     devto_key_input = gr.Textbox(
                         label="DEV.to API Key",
                         type="password",
-                        placeholder="Enter key to override environment variable...",
+                        placeholder=_KEY_PLACEHOLDER,
                     )
 
             with gr.Row():
@@ -918,36 +1171,48 @@ def create_interface():
                 value=get_current_config_status(),
             )
 
-        # Event handlers
+        # Event handlers. Listeners are grouped by the resource they contend
+        # on: LLM-heavy handlers share one concurrency pool, the
+        # pdflatex-compiling handlers another, and pure external-API calls
+        # run unbounded since the providers rate-limit themselves.
         process_btn.click(
             fn=process_paper,
-            inputs=[pdf_input, url_input],
-            # inputs=[pdf_input, url_input, text_input],
+            inputs=[pdf_input, url_input, analysis_state],
+            # inputs=[pdf_input, url_input, text_input, analysis_state],
             outputs=[
                 status_output,
                 analysis_output,
                 blog_status,
                 download_analysis_btn,
+                analysis_state,
             ],
+            concurrency_id="llm_queue",
+            concurrency_limit=5,
         )
 
         download_analysis_btn.click(
             fn=download_analysis_summary,
+            inputs=[analysis_state],
             outputs=[download_analysis_btn],
         )
 
         generate_blog_btn.click(
             fn=generate_blog_content,
-            outputs=[blog_status_output, blog_output, download_blog_btn],
+            inputs=[analysis_state, blog_state],
+            outputs=[blog_status_output, blog_output, download_blog_btn, blog_state],
+            concurrency_id="llm_queue",
+            concurrency_limit=5,
         )
 
         download_blog_btn.click(
             fn=download_blog_markdown,
+            inputs=[blog_state],
             outputs=[download_blog_btn],
         )
 
         generate_social_btn.click(
             fn=generate_social_content,
+            inputs=[analysis_state, tldr_state],
             outputs=[
                 linkedin_output,
                 twitter_output,
@@ -957,51 +1222,119 @@ def create_interface():
                 twitter_image,
                 facebook_image,
                 instagram_image,
+                tldr_state,
             ],
+            concurrency_limit=None,
         )
 
         generate_poster_btn.click(
             fn=generate_poster_content,
-            inputs=[template_dropdown, orientation_dropdown],
+            inputs=[template_dropdown, orientation_dropdown, analysis_state, poster_state],
             outputs=[
                 poster_status,
                 latex_output,
                 poster_pdf_preview,  # Maps to the PDF component
                 download_pdf_btn,  # Maps to the PDF download button
                 download_latex_btn,  # Maps to the LaTeX download button
+                poster_state,
             ],
+            concurrency_id="latex_queue",
+            concurrency_limit=2,
         )
 
         generate_presentation_btn.click(
             fn=generate_presentation_content,
-            inputs=[presentation_template_dropdown, slide_count_slider],
+            inputs=[
+                presentation_template_dropdown,
+                slide_count_slider,
+                analysis_state,
+                presentation_state,
+            ],
             outputs=[
                 presentation_status,
                 beamer_output,
                 presentation_pdf_preview,  # Maps to the PDF component
                 download_presentation_pdf_btn,  # Maps to the PDF download button
                 download_beamer_btn,  # Maps to the Beamer download button
+                presentation_state,
+            ],
+            concurrency_id="latex_queue",
+            concurrency_limit=2,
+        )
+
+        generate_all_btn.click(
+            fn=generate_all,
+            inputs=[
+                template_dropdown,
+                orientation_dropdown,
+                presentation_template_dropdown,
+                slide_count_slider,
+                analysis_state,
+                blog_state,
+                tldr_state,
+                poster_state,
+                presentation_state,
+            ],
+            outputs=[
+                # Blog tab
+                blog_status_output,
+                blog_output,
+                download_blog_btn,
+                blog_state,
+                # Social tab
+                linkedin_output,
+                twitter_output,
+                facebook_output,
+                instagram_output,
+                linkedin_image,
+                twitter_image,
+                facebook_image,
+                instagram_image,
+                tldr_state,
+                # Poster tab
+                poster_status,
+                latex_output,
+                poster_pdf_preview,
+                download_pdf_btn,
+                download_latex_btn,
+                poster_state,
+                # Presentation tab
+                presentation_status,
+                beamer_output,
+                presentation_pdf_preview,
+                download_presentation_pdf_btn,
+                download_beamer_btn,
+                presentation_state,
             ],
+            # Calls the poster and presentation handlers directly, so it
+            # must share the LaTeX pool's cap - otherwise concurrent clicks
+            # bypass it and stack up pdflatex and Playwright runs
+            concurrency_id="latex_queue",
+            concurrency_limit=2,
         )
 
         publish_draft_btn.click(
             fn=publish_draft,
+            inputs=[blog_state],
             outputs=[publish_status],
+            concurrency_limit=None,
         )
 
         publish_now_btn.click(
             fn=publish_now,
+            inputs=[blog_state],
             outputs=[publish_status],
+            concurrency_limit=None,
         )
 
         update_config_btn.click(
             fn=update_api_keys,
             inputs=[
-                heavy_model_key_input,
-                light_model_key_input,
-                coding_model_key_input,
+                key_inputs["heavy_model"],
+                key_inputs["light_model"],
+                key_inputs["coding_model"],
                 devto_key_input,
-                mistral_key_input,
+                key_inputs["mistral"],
             ],
             outputs=[config_status],
         )
@@ -1011,21 +1344,22 @@ def create_interface():
             outputs=[config_status],
         )
 
-    return app
+    # Queue with concurrency so async handlers doing LLM I/O run in parallel
+    # instead of serializing every button click through a single worker;
+    # max_size sheds load with immediate feedback instead of unbounded
+    # waits, and the closed queue API keeps outside clients from filling it
+    return app.queue(default_concurrency_limit=8, max_size=32, api_open=False)
 
 
 if __name__ == "__main__":
-    # Create output directories using pathlib
-    Path("outputs/posters").mkdir(parents=True, exist_ok=True)
-    Path("outputs/blogs").mkdir(parents=True, exist_ok=True)
-    Path("outputs/presentations").mkdir(parents=True, exist_ok=True)
-    Path("data").mkdir(parents=True, exist_ok=True)
-
-    # Launch the application
+    # Launch the application (output directories are ensured at import time)
     app_instance = create_interface()
     app_instance.launch(
         server_name=settings.HOST,
         server_port=settings.PORT,
         debug=settings.DEBUG,
         share=False,
+        # Handlers are I/O-bound waits, not CPU work, so the thread pool
+        # can be wider than Gradio's default 40
+        max_threads=80,
     )